@@ -6,14 +6,15 @@ import os
 import sys
 import re
 import dash
+import numpy as np
 import pandas as pd
-from dash import html, dcc, Input, Output, State, dash_table, no_update, ALL
+from dash import html, dcc, Input, Output, State, dash_table, no_update, ALL, MATCH, ctx
 import dash_bootstrap_components as dbc
 
 # Handle both direct execution and module execution
 try:
     # Try relative imports first (when run as module)
-    from .ui.modern_ui import ModernUI
+    from .ui.modern_ui import ModernUI, PARAM_STORE_DEFAULTS
     from .core.excel_export import ExcelExporter
     from .data.config_manager import app_config, user_prefs, template_manager
     from .data.scenario_manager import scenario_manager, ScenarioComparison
@@ -22,14 +23,13 @@ try:
     from .config.security import security_config, secure_app_initialization, safe_input_handler
 except ImportError:
     # Fall back to absolute imports (when run directly)
-    from ui.modern_ui import ModernUI
+    from ui.modern_ui import ModernUI, PARAM_STORE_DEFAULTS
     from core.excel_export import ExcelExporter
     from data.config_manager import app_config, user_prefs, template_manager
     from data.scenario_manager import scenario_manager, ScenarioComparison
     from core.advanced_analytics import AdvancedAnalytics, ReportGenerator
     from src.simulation import BuildVsBuySimulator
     from config.security import security_config, secure_app_initialization, safe_input_handler
-import plotly.graph_objects as go
 
 
 def safe_float(val, default=0.0):
@@ -107,19 +107,19 @@ class BuildVsBuyApp:
              State('risk_selector', 'value'),
              State('cost_selector', 'value'),
              # Dynamic buy option inputs - using correct IDs from UI
-             State('product_price', 'value'),
-             State('subscription_price', 'value'),
-             State('subscription_increase', 'value'),
+             State({'type': 'param-store', 'field': 'product_price'}, 'data'),
+             State({'type': 'param-store', 'field': 'subscription_price'}, 'data'),
+             State({'type': 'param-store', 'field': 'subscription_increase'}, 'data'),
              # Dynamic risk inputs
-             State('tech_risk', 'value'),
-             State('vendor_risk', 'value'),
-             State('market_risk', 'value'),
+             State({'type': 'param-store', 'field': 'tech_risk'}, 'data'),
+             State({'type': 'param-store', 'field': 'vendor_risk'}, 'data'),
+             State({'type': 'param-store', 'field': 'market_risk'}, 'data'),
              # Dynamic cost inputs
-             State('maint_opex_modern', 'value'),
-             State('maint_opex_std_modern', 'value'),
-             State('maint_escalation_modern', 'value'),
-             State('capex_modern', 'value'),
-             State('amortization_modern', 'value')],
+             State({'type': 'param-store', 'field': 'maint_opex'}, 'data'),
+             State({'type': 'param-store', 'field': 'maint_opex_std'}, 'data'),
+             State({'type': 'param-store', 'field': 'maint_escalation'}, 'data'),
+             State({'type': 'param-store', 'field': 'capex'}, 'data'),
+             State({'type': 'param-store', 'field': 'amortization'}, 'data')],
             prevent_initial_call=True
         )
         def update_modern_calculations(n_clicks, build_timeline, fte_cost, fte_count, 
@@ -223,17 +223,17 @@ class BuildVsBuyApp:
              State('risk_selector', 'value'),
              State('cost_selector', 'value'),
              # Dynamic inputs - using correct IDs
-             State('product_price', 'value'),
-             State('subscription_price', 'value'),
-             State('subscription_increase', 'value'),
-             State('tech_risk', 'value'),
-             State('vendor_risk', 'value'),
-             State('market_risk', 'value'),
-             State('maint_opex_modern', 'value'),
-             State('maint_opex_std_modern', 'value'),
-             State('maint_escalation_modern', 'value'),
-             State('capex_modern', 'value'),
-             State('amortization_modern', 'value')]
+             State({'type': 'param-store', 'field': 'product_price'}, 'data'),
+             State({'type': 'param-store', 'field': 'subscription_price'}, 'data'),
+             State({'type': 'param-store', 'field': 'subscription_increase'}, 'data'),
+             State({'type': 'param-store', 'field': 'tech_risk'}, 'data'),
+             State({'type': 'param-store', 'field': 'vendor_risk'}, 'data'),
+             State({'type': 'param-store', 'field': 'market_risk'}, 'data'),
+             State({'type': 'param-store', 'field': 'maint_opex'}, 'data'),
+             State({'type': 'param-store', 'field': 'maint_opex_std'}, 'data'),
+             State({'type': 'param-store', 'field': 'maint_escalation'}, 'data'),
+             State({'type': 'param-store', 'field': 'capex'}, 'data'),
+             State({'type': 'param-store', 'field': 'amortization'}, 'data')]
         )
         def download_excel(n_clicks, scenario_name, stored_scenarios, 
                           build_timeline, fte_cost, fte_count, build_timeline_std,
@@ -395,6 +395,15 @@ class BuildVsBuyApp:
                 traceback.print_exc()
                 return no_update
         
+        # Copy any dynamically shown parameter input into its matching store
+        @self.app.callback(
+            Output({'type': 'param-store', 'field': MATCH}, 'data'),
+            [Input({'type': 'param-input', 'field': MATCH}, 'value')],
+            prevent_initial_call=True
+        )
+        def sync_param_store(value):
+            return value or PARAM_STORE_DEFAULTS[ctx.triggered_id['field']]
+        
         # Dynamic UI callbacks for risk factors
         @self.app.callback(
             Output('risk_inputs_display', 'children'),
@@ -438,7 +447,7 @@ class BuildVsBuyApp:
                                     html.I(className=f"fas fa-{config['icon']} text-{config['color']}")
                                 ]),
                                 dbc.Input(
-                                    id=f"{risk}_risk_display",  # Different ID to avoid conflict with hidden input
+                                    id={'type': 'param-input', 'field': f"{risk}_risk"},
                                     type="number",
                                     placeholder=config['label'],
                                     value=0,
@@ -454,31 +463,6 @@ class BuildVsBuyApp:
             
             return inputs
         
-        # Sync callbacks to update hidden inputs from display inputs
-        @self.app.callback(
-            Output('tech_risk', 'value'),
-            [Input('tech_risk_display', 'value')],
-            prevent_initial_call=True
-        )
-        def sync_tech_risk(value):
-            return value or 0
-        
-        @self.app.callback(
-            Output('vendor_risk', 'value'),
-            [Input('vendor_risk_display', 'value')],
-            prevent_initial_call=True
-        )
-        def sync_vendor_risk(value):
-            return value or 0
-        
-        @self.app.callback(
-            Output('market_risk', 'value'),
-            [Input('market_risk_display', 'value')],
-            prevent_initial_call=True
-        )
-        def sync_market_risk(value):
-            return value or 0
-        
         # Dynamic UI callbacks for cost components
         @self.app.callback(
             Output('cost_inputs_display', 'children'),
@@ -528,7 +512,7 @@ class BuildVsBuyApp:
                                     "$"
                                 ]),
                                 dbc.Input(
-                                    id=f"maint_{cost}_display" if cost == 'opex' else f"{cost}_display",
+                                    id={'type': 'param-input', 'field': 'maint_opex' if cost == 'opex' else cost},
                                     type="number",
                                     placeholder=config['label'],
                                     value=0,
@@ -551,7 +535,7 @@ class BuildVsBuyApp:
                                         "± $"
                                     ]),
                                     dbc.Input(
-                                        id=f"maint_{cost}_std_display",
+                                        id={'type': 'param-input', 'field': f"maint_{cost}_std"},
                                         type="number",
                                         placeholder="Standard deviation",
                                         value=0,
@@ -574,7 +558,7 @@ class BuildVsBuyApp:
                                         "%"
                                     ]),
                                     dbc.Input(
-                                        id="maint_escalation_display",
+                                        id={'type': 'param-input', 'field': 'maint_escalation'},
                                         type="number",
                                         placeholder="Annual increase rate",
                                         value=3,
@@ -590,54 +574,13 @@ class BuildVsBuyApp:
             
             return inputs
         
-        # Sync callbacks to update hidden cost inputs from display inputs
-        @self.app.callback(
-            Output('maint_opex_modern', 'value'),
-            [Input('maint_opex_display', 'value')],
-            prevent_initial_call=True
-        )
-        def sync_maint_opex(value):
-            return value or 0
-        
-        @self.app.callback(
-            Output('maint_opex_std_modern', 'value'),
-            [Input('maint_opex_std_display', 'value')],
-            prevent_initial_call=True
-        )
-        def sync_maint_opex_std(value):
-            return value or 0
-        
-        @self.app.callback(
-            Output('maint_escalation_modern', 'value'),
-            [Input('maint_escalation_display', 'value')],
-            prevent_initial_call=True
-        )
-        def sync_maint_escalation(value):
-            return value or 3
-        
-        @self.app.callback(
-            Output('capex_modern', 'value'),
-            [Input('capex_display', 'value')],
-            prevent_initial_call=True
-        )
-        def sync_capex(value):
-            return value or 0
-        
-        @self.app.callback(
-            Output('amortization_modern', 'value'),
-            [Input('amortization_display', 'value')],
-            prevent_initial_call=True
-        )
-        def sync_amortization(value):
-            return value or 0
-        
         # Dynamic UI callbacks for buy options
         @self.app.callback(
             Output('buy_inputs_display', 'children'),
             [Input('buy_selector', 'value')],
-            [State('product_price', 'value'),
-             State('subscription_price', 'value'),
-             State('subscription_increase', 'value')],
+            [State({'type': 'param-store', 'field': 'product_price'}, 'data'),
+             State({'type': 'param-store', 'field': 'subscription_price'}, 'data'),
+             State({'type': 'param-store', 'field': 'subscription_increase'}, 'data')],
             prevent_initial_call=False
         )
         def update_buy_inputs(selected_options, current_product_price, current_subscription_price, current_subscription_increase):
@@ -662,7 +605,7 @@ class BuildVsBuyApp:
                                 "$"
                             ]),
                             dbc.Input(
-                                id="product_price_display",
+                                id={'type': 'param-input', 'field': 'product_price'},
                                 type="number",
                                 placeholder="One-time purchase price",
                                 value=product_price_value,
@@ -684,7 +627,7 @@ class BuildVsBuyApp:
                                 "$"
                             ]),
                             dbc.Input(
-                                id="subscription_price_display",
+                                id={'type': 'param-input', 'field': 'subscription_price'},
                                 type="number",
                                 placeholder="Annual subscription cost",
                                 value=subscription_price_value,
@@ -702,7 +645,7 @@ class BuildVsBuyApp:
                                 html.I(className="fas fa-percentage text-warning")
                             ]),
                             dbc.Input(
-                                id="subscription_increase_display",
+                                id={'type': 'param-input', 'field': 'subscription_increase'},
                                 type="number",
                                 placeholder="Annual increase rate",
                                 value=subscription_increase_value,
@@ -718,31 +661,6 @@ class BuildVsBuyApp:
             
             return inputs
         
-        # Sync display inputs with hidden inputs for callbacks
-        @self.app.callback(
-            Output('product_price', 'value'),
-            [Input('product_price_display', 'value')],
-            prevent_initial_call=True
-        )
-        def sync_product_price(value):
-            return value or 0
-        
-        @self.app.callback(
-            Output('subscription_price', 'value'),
-            [Input('subscription_price_display', 'value')],
-            prevent_initial_call=True
-        )
-        def sync_subscription_price(value):
-            return value or 0
-        
-        @self.app.callback(
-            Output('subscription_increase', 'value'),
-            [Input('subscription_increase_display', 'value')],
-            prevent_initial_call=True
-        )
-        def sync_subscription_increase(value):
-            return value or 0
-    
     def create_results_display(self, results):
         """Create modern results display."""
         if not results:
@@ -900,37 +818,11 @@ class BuildVsBuyApp:
         if not results or 'cost_distribution' not in results:
             return {}
         
-        # Cost distribution histogram
-        cost_dist = results['cost_distribution']
-        
-        fig = go.Figure()
-        fig.add_trace(go.Histogram(
-            x=cost_dist,
-            nbinsx=50,
-            name='Build Cost Distribution',
-            marker_color='lightblue',
-            opacity=0.7
-        ))
-        
-        # Add buy cost line
-        buy_cost = results.get('buy_total_cost', 0)
-        if buy_cost > 0:
-            fig.add_vline(
-                x=buy_cost, 
-                line_dash="dash", 
-                line_color="red",
-                annotation_text=f"Buy Cost: ${buy_cost:,.0f}"
-            )
-        
-        fig.update_layout(
-            title="Build Cost Distribution vs Buy Cost",
-            xaxis_title="Cost ($)",
-            yaxis_title="Frequency",
-            template="plotly_white",
-            height=400
+        # Cost distribution, binned and drawn with WebGL traces
+        return self.modern_ui.build_cost_distribution_figure(
+            results['cost_distribution'],
+            results.get('buy_total_cost', 0)
         )
-        
-        return fig
     
     def setup_scenario_callbacks(self):
         """Setup scenario management callbacks."""
@@ -955,16 +847,16 @@ class BuildVsBuyApp:
              State('risk_selector', 'value'),
              State('cost_selector', 'value'),
              # Add dynamic buy and risk inputs - using correct IDs
-             State('product_price', 'value'),
-             State('subscription_price', 'value'),
-             State('subscription_increase', 'value'),
-             State('tech_risk', 'value'),
-             State('vendor_risk', 'value'),
-             State('market_risk', 'value'),
-             State('maint_opex_modern', 'value'),
-             State('maint_opex_std_modern', 'value'),
-             State('capex_modern', 'value'),
-             State('amortization_modern', 'value')]
+             State({'type': 'param-store', 'field': 'product_price'}, 'data'),
+             State({'type': 'param-store', 'field': 'subscription_price'}, 'data'),
+             State({'type': 'param-store', 'field': 'subscription_increase'}, 'data'),
+             State({'type': 'param-store', 'field': 'tech_risk'}, 'data'),
+             State({'type': 'param-store', 'field': 'vendor_risk'}, 'data'),
+             State({'type': 'param-store', 'field': 'market_risk'}, 'data'),
+             State({'type': 'param-store', 'field': 'maint_opex'}, 'data'),
+             State({'type': 'param-store', 'field': 'maint_opex_std'}, 'data'),
+             State({'type': 'param-store', 'field': 'capex'}, 'data'),
+             State({'type': 'param-store', 'field': 'amortization'}, 'data')]
         )
         def save_scenario(n_clicks, scenario_name, stored_scenarios,
                          build_timeline, fte_cost, fte_count, build_timeline_std,
@@ -1270,9 +1162,8 @@ class BuildVsBuyApp:
         if not cost_distribution or buy_total_cost <= 0:
             return 0.0
         
-        # Count how many simulations resulted in build cost < buy cost
-        build_costs_less = sum(1 for cost in cost_distribution if cost < buy_total_cost)
-        probability = (build_costs_less / len(cost_distribution)) * 100
+        # Share of simulations where build cost < buy cost
+        probability = float(np.mean(np.asarray(cost_distribution) < buy_total_cost)) * 100
         
         return max(0, min(100, probability))
     
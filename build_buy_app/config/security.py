@@ -3,8 +3,23 @@ Production Security Configuration for Build vs Buy Dashboard
 Implements security best practices while preserving Dash functionality
 """
 import os
+import re
 from flask import Flask
 
+try:
+    import re2 as _regex_engine  # google-re2: linear-time matching, no backtracking
+except ImportError:
+    _regex_engine = re
+
+# Injection patterns rejected by validate_inputs (matched case-insensitively)
+DANGEROUS_PATTERNS = (
+    '<script', '</script>', 'javascript:', 'onload=', 'onerror=',
+    'eval(', 'exec(', '__import__', 'subprocess', 'os.system'
+)
+
+# All patterns combined into one pattern, compiled once at import
+_BLOCKLIST = _regex_engine.compile('(?i)' + '|'.join(re.escape(p) for p in DANGEROUS_PATTERNS))
+
 
 class DashSecurityConfig:
     """Security configuration optimized for Dash applications."""
@@ -95,16 +110,10 @@ class DashSecurityConfig:
         # Convert to string and basic sanitization
         sanitized = str(user_input).strip()
         
-        # Check for basic injection patterns
-        dangerous_patterns = [
-            '<script', '</script>', 'javascript:', 'onload=', 'onerror=',
-            'eval(', 'exec(', '__import__', 'subprocess', 'os.system'
-        ]
-        
-        lower_input = sanitized.lower()
-        for pattern in dangerous_patterns:
-            if pattern in lower_input:
-                raise ValueError(f"Invalid input detected: {pattern}")
+        # Check for basic injection patterns in a single scan
+        match = _BLOCKLIST.search(sanitized)
+        if match:
+            raise ValueError(f"Invalid input detected: {match.group(0).lower()}")
         
         return sanitized
     
@@ -114,8 +123,10 @@ class DashSecurityConfig:
             if value in (None, "", "null", "undefined"):
                 return default
                 
-            # Validate input first
-            sanitized = self.validate_inputs(value)
+            # Plain numbers cannot contain a blocked pattern, so only scan everything else
+            sanitized = str(value).strip()
+            if not sanitized.lstrip('-').replace('.', '', 1).isdigit():
+                sanitized = self.validate_inputs(sanitized)
             
             # Convert to float
             result = float(sanitized)
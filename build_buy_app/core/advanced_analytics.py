@@ -3,7 +3,7 @@ Enhanced Analytics Features for Build vs Buy Dashboard
 Adds advanced visualization and analysis capabilities
 """
 import plotly.graph_objects as go
-import plotly.express as px
+from plotly.colors import qualitative
 from plotly.subplots import make_subplots
 import numpy as np
 import pandas as pd
@@ -52,7 +52,7 @@ class AdvancedAnalytics:
                 y=[param],
                 x=[high - low],
                 orientation='h',
-                marker_color=px.colors.qualitative.Set2[i % len(px.colors.qualitative.Set2)]
+                marker_color=qualitative.Set2[i % len(qualitative.Set2)]
             ))
         
         fig.update_layout(
@@ -2,12 +2,179 @@
 Fixed Excel Export Module for Build vs Buy Dashboard
 Addresses formula corruption issues causing Excel repair warnings
 """
+import threading
 import xlsxwriter
 import zipfile
-import re
 from io import BytesIO
 from datetime import datetime
 
+# Finished workbooks keyed by their export inputs, shared across exporter
+# instances so repeated exports of an unchanged scenario skip the rebuild.
+# The lock keeps lookups and oldest-first eviction consistent across threads.
+_EXPORT_CACHE = {}
+_EXPORT_CACHE_SIZE = 32
+_EXPORT_CACHE_LOCK = threading.Lock()
+
+# Input Parameters sheet layout: (section title, [(label, key, default, description, format), ...]).
+# The untitled first section sits directly under the sheet title.
+INPUT_PARAM_SECTIONS = (
+    (None, (
+        ('Build Timeline (months)', 'build_timeline', 12, 'Development duration', 'currency'),
+        ('FTE Cost (annual)', 'fte_cost', 150000, 'Fully loaded annual cost per developer', 'currency'),
+        ('FTE Count', 'fte_count', 2, 'Number of developers', 'currency'),
+        ('Success Probability', 'prob_success', 80, 'Probability of successful delivery', 'percent'),
+        ('WACC Discount Rate', 'wacc', 10, 'Weighted average cost of capital', 'percent'),
+        ('Useful Life (years)', 'useful_life', 5, 'Asset useful life', 'currency'),
+    )),
+    ('Risk Factors', (
+        ('Technical Risk', 'tech_risk', 10, 'Additional cost risk %', 'percent'),
+        ('Vendor Risk', 'vendor_risk', 5, 'Vendor-related cost risk %', 'percent'),
+        ('Market Risk', 'market_risk', 5, 'Market change risk %', 'percent'),
+    )),
+    ('Additional Costs', (
+        ('CapEx Investment', 'capex', 0, 'Infrastructure/hardware costs', 'currency'),
+        ('Miscellaneous Costs', 'misc_costs', 0, 'Other one-time costs', 'currency'),
+        ('Monthly Amortization', 'amortization', 0, 'Monthly recurring costs during build', 'currency'),
+        ('Annual Maintenance', 'maint_opex', 0, 'Ongoing annual maintenance', 'currency'),
+        ('Maintenance Escalation', 'maint_escalation', 3, 'Annual maintenance cost increase %', 'percent'),
+    )),
+)
+
+# Every scenario field the workbook reads. The export cache is keyed on these
+# only, so per-export fields such as 'name', 'timestamp' and 'results' never
+# defeat it. A build that reads any other field is not cached (see _ReadTracker).
+_WORKBOOK_INPUT_KEYS = tuple(
+    key for _, rows in INPUT_PARAM_SECTIONS for _, key, *_ in rows
+) + ('buy_selector', 'product_price', 'subscription_price', 'subscription_increase')
+
+
+class _ReadTracker(dict):
+    """Scenario dict that records which fields the sheet builders look up."""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.read_keys = set()
+    
+    def get(self, key, default=None):
+        self.read_keys.add(key)
+        return super().get(key, default)
+    
+    def __getitem__(self, key):
+        self.read_keys.add(key)
+        return super().__getitem__(key)
+    
+    def __contains__(self, key):
+        self.read_keys.add(key)
+        return super().__contains__(key)
+
+
+def _input_sheet_rows():
+    """
+    Lay out the Input Parameters sheet from INPUT_PARAM_SECTIONS.
+    
+    Returns:
+        tuple: ({section title: row}, {parameter key: row}) with 0-based rows
+    """
+    section_rows = {}
+    param_rows = {}
+    row = 2  # Below the merged sheet title
+    
+    for title, params in INPUT_PARAM_SECTIONS:
+        if title:
+            # Blank spacer row, then the section subheader
+            section_rows[title] = row + 1
+            row += 2
+        for param in params:
+            param_rows[param[1]] = row
+            row += 1
+    
+    # Two spacer rows before the calculated section
+    section_rows['Calculated Values'] = row + 2
+    param_rows['total_fte_cost'] = row + 3
+    return section_rows, param_rows
+
+
+_INPUT_SECTION_ROWS, _INPUT_PARAM_ROWS = _input_sheet_rows()
+
+# Value cell of every Input Parameters entry, e.g. {'build_timeline': 'B3', ...}
+INPUT_PARAM_COORDS = {key: f"B{row + 1}" for key, row in _INPUT_PARAM_ROWS.items()}
+
+
+# xlsxwriter format properties by name; formats are bound to a workbook, so
+# each export turns these shared specs into its own Format objects
+_FORMAT_SPECS = {
+    'header': {
+        'bold': True, 'font_size': 14, 'bg_color': '#4472C4',
+        'font_color': 'white', 'align': 'center', 'valign': 'vcenter',
+        'border': 1
+    },
+    'subheader': {
+        'bold': True, 'font_size': 12, 'bg_color': '#D9E2F3',
+        'align': 'center', 'border': 1
+    },
+    'currency': {
+        'num_format': '$#,##0', 'align': 'right', 'border': 1
+    },
+    'currency_bold': {
+        'num_format': '$#,##0', 'align': 'right', 'bold': True, 'border': 1
+    },
+    'percent': {
+        'num_format': '0.0%', 'align': 'right', 'border': 1
+    },
+    'number': {
+        'num_format': '0.00', 'align': 'right', 'border': 1
+    },
+    'text': {
+        'align': 'left', 'border': 1
+    },
+    'text_bold': {
+        'bold': True, 'align': 'left', 'border': 1
+    },
+    'input_cell': {
+        'bg_color': '#FFFF99', 'border': 1, 'align': 'right'
+    },
+    'calculated_cell': {
+        'bg_color': '#C6EFCE', 'border': 1, 'align': 'right', 'num_format': '$#,##0'
+    },
+    'sensitivity_control': {
+        'bg_color': '#FFE6CC', 'border': 1, 'align': 'center', 'bold': True
+    },
+    'sensitivity_result': {
+        'bg_color': '#E6F3FF', 'border': 1, 'align': 'right', 'num_format': '$#,##0'
+    },
+    'green_highlight': {
+        'bg_color': '#C6EFCE', 'border': 1, 'align': 'right', 'num_format': '$#,##0'
+    },
+    'red_highlight': {
+        'bg_color': '#FFC7CE', 'border': 1, 'align': 'right', 'num_format': '$#,##0'
+    },
+    'small_text': {
+        'font_size': 8, 'align': 'center', 'border': 1
+    },
+    # Editable (unlocked) orange controls on the sensitivity/breakeven sheets
+    'interactive': {
+        'bg_color': '#FFE6CC', 'border': 1, 'align': 'center', 'bold': True,
+        'locked': False, 'num_format': '0'
+    },
+    'interactive_currency': {
+        'bg_color': '#FFE6CC', 'border': 1, 'align': 'right', 'bold': True,
+        'locked': False, 'num_format': '$#,##0'
+    },
+    # Light blue calculated results on the sensitivity/breakeven sheets
+    'impact': {
+        'bg_color': '#E6F3FF', 'border': 1, 'align': 'center', 'bold': True,
+        'num_format': '0.0'
+    },
+    'breakeven_result': {
+        'bg_color': '#E6F3FF', 'border': 1, 'align': 'right', 'bold': True,
+        'num_format': '$#,##0'
+    },
+    'breakeven_number': {
+        'bg_color': '#E6F3FF', 'border': 1, 'align': 'right', 'bold': True,
+        'num_format': '0.0'
+    }
+}
+
 
 def safe_float(val, default=0.0):
     """Safely convert value to float."""
@@ -65,6 +232,21 @@ class ExcelExporter:
     SENSITIVITY_SHEET = 'Sensitivity Analysis'
     BREAKEVEN_SHEET = 'Breakeven Analysis'
 
+    # Characters that are not allowed in exported filenames
+    _FNAME_TRANS = str.maketrans(dict.fromkeys('<>:"/\\|?*', '_'))
+
+    # Sensitivity cost model (no leading '='); placeholders are cell references
+    _SENSITIVITY_COST_EXPR = (
+        "(({timeline}/12)*{fte_cost}*{team_size}/({success_prob}/100)+{misc_costs})"
+        "*(1+{risk_factor}/100)"
+    )
+
+    # Workbook-level defined names for key result cells
+    RISK_ADJUSTED_TOTAL_NAME = 'RiskAdjustedTotal'
+    LABOR_PV_NAME = 'LaborPV'
+    MAINTENANCE_PV_NAME = 'MaintenancePV'
+    RISK_PREMIUM_NAME = 'RiskPremium'
+
     def __init__(self):
         """Initialize the Excel exporter."""
         self.param_cells = {}
@@ -86,31 +268,29 @@ class ExcelExporter:
             bytes: Excel workbook as bytes
         """
         try:
+            cache_key = self._export_cache_key(scenario_data)
+            with _EXPORT_CACHE_LOCK:
+                cached = _EXPORT_CACHE.get(cache_key)
+            if cached is not None:
+                return cached
+            
             output = BytesIO()
+            tracked_data = _ReadTracker(scenario_data)
+            self._write_xlsx_to_stream(tracked_data, output)
+            excel_data = output.getvalue()
             
-            # Use more conservative options to prevent corruption
-            workbook_options = {
-                'strings_to_numbers': False,  # Prevent automatic conversion issues
-                'nan_inf_to_errors': True,    # Convert NaN/Inf to Excel errors
-                'default_date_format': 'mm/dd/yyyy'
-            }
+            # A field missing from the key could make a later hit return a stale workbook
+            unkeyed = tracked_data.read_keys.difference(_WORKBOOK_INPUT_KEYS)
+            if unkeyed:
+                print(f"⚠️ Export not cached: workbook read fields missing from _WORKBOOK_INPUT_KEYS: {sorted(unkeyed)}")
+                return excel_data
             
-            with xlsxwriter.Workbook(output, workbook_options) as workbook:
-                # Define formats
-                formats = self._create_formats(workbook)
-                
-                # Store scenario data for reference
-                self.scenario_data = scenario_data
-
-                # Create sheets in order
-                self._create_input_parameters_sheet(workbook, formats, scenario_data)
-                self._create_cost_breakdown_timeline(workbook, formats, scenario_data)
-                self._create_sensitivity_analysis_sheet(workbook, formats, scenario_data)
-                self._create_breakeven_analysis_sheet(workbook, formats, scenario_data)
-                # Removed executive summary and methodology sheets per user request
-            
-            output.seek(0)
-            return output.getvalue()
+            with _EXPORT_CACHE_LOCK:
+                # Evict the oldest entry once the cache is full
+                if cache_key not in _EXPORT_CACHE and len(_EXPORT_CACHE) >= _EXPORT_CACHE_SIZE:
+                    _EXPORT_CACHE.pop(next(iter(_EXPORT_CACHE)))
+                _EXPORT_CACHE[cache_key] = excel_data
+            return excel_data
             
         except Exception as e:
             print(f"Error creating Excel export: {e}")
@@ -118,6 +298,80 @@ class ExcelExporter:
             traceback.print_exc()
             return None
     
+    @staticmethod
+    def _export_cache_key(scenario_data):
+        """
+        Build a hashable cache key from the inputs that shape the workbook.
+        
+        Only the fields listed in _WORKBOOK_INPUT_KEYS are used. Scenario name,
+        export timestamp and simulation results are never written to the
+        workbook (the filename is built by the caller), so leaving them out
+        lets repeated downloads of the same inputs hit the cache. A hit returns
+        the workbook as first built, including its document creation time.
+        
+        Absent fields get a one-element entry, so they never collide with an
+        explicit None: the sheet builders fall back to their defaults only
+        for absent fields, which gives a different workbook.
+        
+        Args:
+            scenario_data: Dictionary containing scenario parameters
+            
+        Returns:
+            tuple: (key, repr(value)) or (key,) entries in _WORKBOOK_INPUT_KEYS order
+        """
+        return tuple(
+            (key, repr(scenario_data[key])) if key in scenario_data else (key,)
+            for key in _WORKBOOK_INPUT_KEYS
+        )
+    
+    def _write_xlsx_to_stream(self, scenario_data, stream):
+        """
+        Write the scenario workbook into a writable file-like object.
+        
+        Args:
+            scenario_data: Dictionary containing scenario parameters
+            stream: Writable binary file-like object (BytesIO, ZIP entry, ...)
+        """
+        # Use more conservative options to prevent corruption
+        workbook_options = {
+            'strings_to_numbers': False,  # Prevent automatic conversion issues
+            'nan_inf_to_errors': True,    # Convert NaN/Inf to Excel errors
+            'default_date_format': 'mm/dd/yyyy',
+            'strings_to_formulas': False, # Formulas are always written explicitly
+            'in_memory': True             # Workbooks are a few KB; assemble parts in memory, no temp files
+        }
+        
+        with xlsxwriter.Workbook(stream, workbook_options) as workbook:
+            # Define formats
+            formats = self._create_formats(workbook)
+            
+            # Store scenario data for reference
+            self.scenario_data = scenario_data
+
+            # Create sheets in order
+            self._create_input_parameters_sheet(workbook, formats, scenario_data)
+            self._create_cost_breakdown_timeline(workbook, formats, scenario_data)
+            self._create_sensitivity_analysis_sheet(workbook, formats, scenario_data)
+            self._create_breakeven_analysis_sheet(workbook, formats, scenario_data)
+            # Removed executive summary and methodology sheets per user request
+    
+    def _scenario_filename(self, scenario):
+        """Build a filesystem-safe export filename for a stored scenario."""
+        scenario_name = scenario.get('name', 'Unnamed_Scenario')
+        
+        # Clean scenario name for filename (remove invalid characters)
+        clean_name = scenario_name.translate(self._FNAME_TRANS)
+        clean_name = clean_name.strip()[:50]  # Limit length
+        
+        if not clean_name:
+            clean_name = "Unnamed_Scenario"
+        
+        # Create timestamp
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        
+        # Build filename: "ScenarioName_BuildVsBuyAnalysis_20250814_143022.xlsx"
+        return f"{clean_name}_BuildVsBuyAnalysis_{timestamp}.xlsx"
+    
     def create_multiple_scenario_exports(self, stored_scenarios):
         """
         Create separate Excel files for each saved scenario.
@@ -135,21 +389,8 @@ class ExcelExporter:
         
         for scenario in stored_scenarios:
             try:
-                # Extract scenario name for filename
                 scenario_name = scenario.get('name', 'Unnamed_Scenario')
-                
-                # Clean scenario name for filename (remove invalid characters)
-                clean_name = re.sub(r'[<>:"/\\|?*]', '_', scenario_name)
-                clean_name = clean_name.strip()[:50]  # Limit length
-                
-                if not clean_name:
-                    clean_name = "Unnamed_Scenario"
-                
-                # Create timestamp
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                
-                # Build filename: "ScenarioName_BuildVsBuyAnalysis_20250814_143022.xlsx"
-                filename = f"{clean_name}_BuildVsBuyAnalysis_{timestamp}.xlsx"
+                filename = self._scenario_filename(scenario)
                 
                 # Generate Excel file using existing function
                 excel_bytes = self.create_excel_export(scenario)
@@ -170,6 +411,12 @@ class ExcelExporter:
         """
         Create a ZIP file containing Excel files for all scenarios.
         
+        Each workbook is rendered into a seekable buffer before it is added, so
+        ZIP members are byte-for-byte the same kind of .xlsx as a single export,
+        and a scenario that fails to render is skipped instead of aborting the
+        archive. The entries are stored rather than deflated because .xlsx
+        files are already compressed.
+        
         Args:
             stored_scenarios: List of stored scenario dictionaries
             
@@ -177,22 +424,39 @@ class ExcelExporter:
             bytes: ZIP file as bytes, or None if error
         """
         try:
-            # Get all Excel exports
-            exports = self.create_multiple_scenario_exports(stored_scenarios)
-            
-            if not exports:
+            if not stored_scenarios:
                 print("No Excel files were created successfully")
                 return None
             
-            # Create ZIP file in memory
+            # Create ZIP file in memory. Each .xlsx is itself a deflated ZIP package
+            # (xlsxwriter does not expose its compression level), so the outer
+            # archive stores entries as-is rather than compressing them again.
             zip_buffer = BytesIO()
+            file_count = 0
             
-            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                for filename, excel_bytes in exports:
-                    zip_file.writestr(filename, excel_bytes)
+            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_STORED) as zip_file:
+                for scenario in stored_scenarios:
+                    try:
+                        filename = self._scenario_filename(scenario)
+                        
+                        # xlsxwriter needs a seekable stream to write a standard package
+                        # (a raw ZIP entry would force data descriptors on every member)
+                        workbook_buffer = BytesIO()
+                        self._write_xlsx_to_stream(scenario, workbook_buffer)
+                        zip_file.writestr(filename, workbook_buffer.getvalue())
+                        file_count += 1
+                        print(f"✅ Created Excel file for scenario: {scenario.get('name', 'Unnamed_Scenario')}")
+                        
+                    except Exception as e:
+                        print(f"Error processing scenario {scenario.get('name', 'Unknown')}: {e}")
+                        continue
+            
+            if not file_count:
+                print("No Excel files were created successfully")
+                return None
             
             zip_buffer.seek(0)
-            print(f"✅ Created ZIP file with {len(exports)} Excel files")
+            print(f"✅ Created ZIP file with {file_count} Excel files")
             return zip_buffer.getvalue()
             
         except Exception as e:
@@ -203,69 +467,17 @@ class ExcelExporter:
     
     def _create_formats(self, workbook):
         """Create consistent formatting styles."""
-        return {
-            'header': workbook.add_format({
-                'bold': True, 'font_size': 14, 'bg_color': '#4472C4',
-                'font_color': 'white', 'align': 'center', 'valign': 'vcenter',
-                'border': 1
-            }),
-            'subheader': workbook.add_format({
-                'bold': True, 'font_size': 12, 'bg_color': '#D9E2F3',
-                'align': 'center', 'border': 1
-            }),
-            'currency': workbook.add_format({
-                'num_format': '$#,##0', 'align': 'right', 'border': 1
-            }),
-            'currency_bold': workbook.add_format({
-                'num_format': '$#,##0', 'align': 'right', 'bold': True, 'border': 1
-            }),
-            'percent': workbook.add_format({
-                'num_format': '0.0%', 'align': 'right', 'border': 1
-            }),
-            'number': workbook.add_format({
-                'num_format': '0.00', 'align': 'right', 'border': 1
-            }),
-            'text': workbook.add_format({
-                'align': 'left', 'border': 1
-            }),
-            'text_bold': workbook.add_format({
-                'bold': True, 'align': 'left', 'border': 1
-            }),
-            'input_cell': workbook.add_format({
-                'bg_color': '#FFFF99', 'border': 1, 'align': 'right'
-            }),
-            'calculated_cell': workbook.add_format({
-                'bg_color': '#C6EFCE', 'border': 1, 'align': 'right', 'num_format': '$#,##0'
-            }),
-            'sensitivity_control': workbook.add_format({
-                'bg_color': '#FFE6CC', 'border': 1, 'align': 'center', 'bold': True
-            }),
-            'sensitivity_result': workbook.add_format({
-                'bg_color': '#E6F3FF', 'border': 1, 'align': 'right', 'num_format': '$#,##0'
-            }),
-            'green_highlight': workbook.add_format({
-                'bg_color': '#C6EFCE', 'border': 1, 'align': 'right', 'num_format': '$#,##0'
-            }),
-            'red_highlight': workbook.add_format({
-                'bg_color': '#FFC7CE', 'border': 1, 'align': 'right', 'num_format': '$#,##0'
-            }),
-            'small_text': workbook.add_format({
-                'font_size': 8, 'align': 'center', 'border': 1
-            })
-        }
+        return {name: workbook.add_format(spec) for name, spec in _FORMAT_SPECS.items()}
     
     def _create_input_parameters_sheet(self, workbook, formats, scenario_data):
         """Create input parameters sheet with safe formulas."""
         worksheet = workbook.add_worksheet(self.INPUT_SHEET)
-        row = 0
         
         # Title
         worksheet.merge_range('A1:C1', 'Build vs Buy Analysis - Input Parameters', formats['header'])
-        row += 2
-        
+
         # Helper function to add parameter row
-        def add_param(label, key, value, description="", format_type="currency"):
-            nonlocal row
+        def add_param(row, label, key, value, description="", format_type="currency"):
             worksheet.write_string(row, 0, label, formats['text_bold'])
             
             # Convert percentage values properly
@@ -279,39 +491,18 @@ class ExcelExporter:
             worksheet.write_string(row, 2, description, formats['text'])
             
             # Store cell reference
-            self.param_cells[key] = f"'Input Parameters'!B{row+1}"
-            row += 1
+            self.param_cells[key] = f"'{self.INPUT_SHEET}'!{INPUT_PARAM_COORDS[key]}"
         
-        # Core parameters
-        add_param('Build Timeline (months)', 'build_timeline', scenario_data.get('build_timeline', 12), 'Development duration')
-        add_param('FTE Cost (annual)', 'fte_cost', scenario_data.get('fte_cost', 150000), 'Fully loaded annual cost per developer')
-        add_param('FTE Count', 'fte_count', scenario_data.get('fte_count', 2), 'Number of developers')
-        add_param('Success Probability', 'prob_success', scenario_data.get('prob_success', 80), 'Probability of successful delivery', 'percent')
-        add_param('WACC Discount Rate', 'wacc', scenario_data.get('wacc', 10), 'Weighted average cost of capital', 'percent')
-        add_param('Useful Life (years)', 'useful_life', scenario_data.get('useful_life', 5), 'Asset useful life')
-        
-        # Risk factors
-        row += 1
-        worksheet.write_string(row, 0, 'Risk Factors', formats['subheader'])
-        row += 1
-        add_param('Technical Risk', 'tech_risk', scenario_data.get('tech_risk', 10), 'Additional cost risk %', 'percent')
-        add_param('Vendor Risk', 'vendor_risk', scenario_data.get('vendor_risk', 5), 'Vendor-related cost risk %', 'percent')
-        add_param('Market Risk', 'market_risk', scenario_data.get('market_risk', 5), 'Market change risk %', 'percent')
-        
-        # Cost components
-        row += 1
-        worksheet.write_string(row, 0, 'Additional Costs', formats['subheader'])
-        row += 1
-        add_param('CapEx Investment', 'capex', scenario_data.get('capex', 0), 'Infrastructure/hardware costs')
-        add_param('Miscellaneous Costs', 'misc_costs', scenario_data.get('misc_costs', 0), 'Other one-time costs')
-        add_param('Monthly Amortization', 'amortization', scenario_data.get('amortization', 0), 'Monthly recurring costs during build')
-        add_param('Annual Maintenance', 'maint_opex', scenario_data.get('maint_opex', 0), 'Ongoing annual maintenance')
-        add_param('Maintenance Escalation', 'maint_escalation', scenario_data.get('maint_escalation', 3), 'Annual maintenance cost increase %', 'percent')
+        # Parameter rows come from the shared layout table, in sheet order
+        for title, params in INPUT_PARAM_SECTIONS:
+            if title:
+                worksheet.write_string(_INPUT_SECTION_ROWS[title], 0, title, formats['subheader'])
+            for label, key, default, description, format_type in params:
+                add_param(_INPUT_PARAM_ROWS[key], label, key, scenario_data.get(key, default), description, format_type)
         
         # Calculated values section
-        row += 2
-        worksheet.write_string(row, 0, 'Calculated Values', formats['subheader'])
-        row += 1
+        row = _INPUT_PARAM_ROWS['total_fte_cost']
+        worksheet.write_string(_INPUT_SECTION_ROWS['Calculated Values'], 0, 'Calculated Values', formats['subheader'])
         
         # Total FTE Costs calculation with safe formula
         worksheet.write_string(row, 0, 'Total FTE Costs ($)', formats['text_bold'])
@@ -324,14 +515,25 @@ class ExcelExporter:
         formula = f"=({timeline_ref}/12)*{fte_cost_ref}*{fte_count_ref}/{prob_success_ref}"
         worksheet.write_formula(row, 1, safe_formula(formula), formats['calculated_cell'])
         worksheet.write_string(row, 2, 'Total labor costs (success-adjusted)', formats['text'])
-        self.param_cells['total_fte_cost'] = f"'Input Parameters'!B{row+1}"
-        row += 1
+        self.param_cells['total_fte_cost'] = f"'{self.INPUT_SHEET}'!{INPUT_PARAM_COORDS['total_fte_cost']}"
         
         # Set column widths
         worksheet.set_column('A:A', 25)
         worksheet.set_column('B:B', 15)
         worksheet.set_column('C:C', 50)
     
+    def _define_timeline_name(self, workbook, name, row, col):
+        """
+        Attach a workbook-level defined name to a single Cost Timeline cell.
+        
+        Args:
+            workbook: xlsxwriter Workbook being built
+            name: Defined name to create
+            row: Zero-based row index of the cell
+            col: Zero-based column index of the cell
+        """
+        workbook.define_name(name, f"='{self.TIMELINE_SHEET}'!${chr(65+col)}${row+1}")
+    
     def _create_cost_breakdown_timeline(self, workbook, formats, scenario_data):
         """Create comprehensive cost timeline with build vs buy comparison."""
         ws = workbook.add_worksheet(self.TIMELINE_SHEET)
@@ -363,8 +565,8 @@ class ExcelExporter:
         row += 2
         
         # Create headers with enhanced formatting
-        for col, header in enumerate(headers):
-            ws.write_string(row, col, header, formats['subheader'])
+        ws.write_row(row, 0, headers, formats['subheader'])
+        for col in range(len(headers)):
             # Set column widths for better readability
             if col == 0:  # Cost Component column
                 ws.set_column(col, col, 25)
@@ -410,16 +612,14 @@ class ExcelExporter:
                 labor_pv_formula = f"=({cost_ref}/{success_prob_ref})*{pv_factor_formula}"
                 
                 ws.write_formula(row, 1, safe_formula(labor_pv_formula), formats['currency'])
-                for year_col in range(2, total_col):
-                    ws.write_number(row, year_col, 0, formats['currency'])
+                ws.write_row(row, 2, [0] * (total_col - 2), formats['currency'])
                 # NPV is the same as the Year 0 value since it's already PV
                 ws.write_formula(row, npv_col, safe_formula(labor_pv_formula), formats['currency_bold'])
             
             elif timing == 'immediate':
                 # All cost in Year 0 - no discounting needed
                 ws.write_formula(row, 1, safe_formula(f"={cost_ref}"), formats['currency'])
-                for year_col in range(2, total_col):
-                    ws.write_number(row, year_col, 0, formats['currency'])
+                ws.write_row(row, 2, [0] * (total_col - 2), formats['currency'])
                 ws.write_formula(row, npv_col, safe_formula(f"={cost_ref}"), formats['currency_bold'])
             
             elif timing == 'amortization_pv':
@@ -431,8 +631,7 @@ class ExcelExporter:
                 pv_amortization_formula = f"=IF({cost_ref}=0,0,{cost_ref}*((1-(1+{monthly_rate_formula})^-{timeline_ref})/{monthly_rate_formula}))"
                 
                 ws.write_formula(row, 1, safe_formula(pv_amortization_formula), formats['currency'])
-                for year_col in range(2, total_col):
-                    ws.write_number(row, year_col, 0, formats['currency'])
+                ws.write_row(row, 2, [0] * (total_col - 2), formats['currency'])
                 ws.write_formula(row, npv_col, safe_formula(pv_amortization_formula), formats['currency_bold'])
             
             elif timing == 'maintenance_pv':
@@ -451,8 +650,7 @@ class ExcelExporter:
                         ws.write_formula(row, year_col, safe_formula(escalated_formula), formats['currency'])
                 
                 # Fill remaining years with zeros
-                for year_col in range(useful_life + 2, total_col):
-                    ws.write_number(row, year_col, 0, formats['currency'])
+                ws.write_row(row, useful_life + 2, [0] * (total_col - useful_life - 2), formats['currency'])
                 
                 # NPV calculation for escalating annuity (same as before - this is correct)
                 if maint_escalation == 0:
@@ -464,6 +662,10 @@ class ExcelExporter:
             
             # Add description
             ws.write_string(row, notes_col, description, formats['text'])
+            if timing == 'labor_pv':
+                self._define_timeline_name(workbook, self.LABOR_PV_NAME, row, npv_col)
+            elif timing == 'maintenance_pv':
+                self._define_timeline_name(workbook, self.MAINTENANCE_PV_NAME, row, npv_col)
             build_pv_rows.append(row)
             row += 1
         
@@ -487,6 +689,7 @@ class ExcelExporter:
         risk_formula = f"=({all_build_npv_formula})*({tech_risk_ref}+{vendor_risk_ref}+{market_risk_ref})"
         ws.write_formula(row, npv_col, safe_formula(risk_formula), formats['currency_bold'])
         ws.write_string(row, notes_col, 'Additional cost due to technical, vendor, and market risks (applied to all costs)', formats['text'])
+        self._define_timeline_name(workbook, self.RISK_PREMIUM_NAME, row, npv_col)
         
         risk_adjustment_row = row
         row += 2
@@ -501,6 +704,9 @@ class ExcelExporter:
         ws.write_formula(row, npv_col, safe_formula(f"={total_build_formula}"), formats['currency_bold'])
         ws.write_string(row, notes_col, 'Total build option cost with risk adjustments', formats['text_bold'])
         
+        # Name the risk-adjusted total so readers can jump straight to it
+        self._define_timeline_name(workbook, self.RISK_ADJUSTED_TOTAL_NAME, row, npv_col)
+        
         self.build_total_row = row
         row += 2
         
@@ -535,8 +741,7 @@ class ExcelExporter:
         if 'one_time' in buy_selector and product_price > 0:
             ws.write_string(row, 0, 'Software License/Purchase', formats['text'])
             ws.write_number(row, 1, product_price, formats['currency'])  # Year 0
-            for year_col in range(2, total_col):
-                ws.write_number(row, year_col, 0, formats['currency'])
+            ws.write_row(row, 2, [0] * (total_col - 2), formats['currency'])
             ws.write_number(row, npv_col, product_price, formats['currency_bold'])  # No discounting for Year 0
             ws.write_string(row, notes_col, 'One-time software purchase', formats['text'])
             buy_pv_rows.append(row)
@@ -554,8 +759,7 @@ class ExcelExporter:
                     ws.write_number(row, year_col, escalated_cost, formats['currency'])
             
             # Fill remaining years with zeros if any
-            for year_col in range(useful_life + 2, total_col):
-                ws.write_number(row, year_col, 0, formats['currency'])
+            ws.write_row(row, useful_life + 2, [0] * (total_col - useful_life - 2), formats['currency'])
             
             # NPV calculation for subscription
             if subscription_increase == 0:
@@ -642,32 +846,10 @@ class ExcelExporter:
         """Create comprehensive sensitivity analysis sheet with interactive controls and proper formatting."""
         ws = workbook.add_worksheet(self.SENSITIVITY_SHEET)
         
-        # Create special formats for interactive elements
-        interactive_format = workbook.add_format({
-            'bg_color': '#FFE6CC',  # Orange background
-            'border': 1,
-            'align': 'center',
-            'bold': True,
-            'locked': False,  # Allow editing
-            'num_format': '0'
-        })
-        
-        interactive_currency_format = workbook.add_format({
-            'bg_color': '#FFE6CC',  # Orange background
-            'border': 1,
-            'align': 'right',
-            'bold': True,
-            'locked': False,  # Allow editing
-            'num_format': '$#,##0'
-        })
-        
-        impact_format = workbook.add_format({
-            'bg_color': '#E6F3FF',  # Light blue background
-            'border': 1,
-            'align': 'center',
-            'bold': True,
-            'num_format': '0.0'
-        })
+        # Shared formats for interactive elements
+        interactive_format = formats['interactive']
+        interactive_currency_format = formats['interactive_currency']
+        impact_format = formats['impact']
         
         # Sheet title and description
         ws.merge_range('A1:F1', '📊 Sensitivity Analysis - Interactive Decision Tool', formats['header'])
@@ -716,94 +898,61 @@ class ExcelExporter:
             'risk_factor': {'low_delta': -10, 'high_delta': 20}   # -10% to +20%
         }
         
-        # Build Timeline Control
-        ws.write_string(row, 0, 'Build Timeline (months)', formats['text'])
+        # Current value and low/high range for each control
         timeline_base = safe_float(base_params.get('build_timeline', 12))
-        timeline_low = max(1, timeline_base * SENSITIVITY_RANGES['timeline']['low_pct'])
-        timeline_high = timeline_base * SENSITIVITY_RANGES['timeline']['high_pct']
-        ws.write_number(row, 1, timeline_base, interactive_format)
-        ws.write_number(row, 2, timeline_low, interactive_format)
-        ws.write_number(row, 3, timeline_high, interactive_format)
-        impact_score = ((timeline_high - timeline_low) / timeline_base) * 100
-        ws.write_number(row, 4, impact_score, impact_format)
-        control_cells['timeline'] = f'B{row+1}'
-        range_cells['timeline_low'] = f'C{row+1}'
-        range_cells['timeline_high'] = f'D{row+1}'
-        row += 1
-        
-        # FTE Cost Control
-        ws.write_string(row, 0, 'FTE Cost (annual)', formats['text'])
         fte_base = safe_float(base_params.get('fte_cost', 150000))
-        fte_low = fte_base * SENSITIVITY_RANGES['fte_cost']['low_pct']
-        fte_high = fte_base * SENSITIVITY_RANGES['fte_cost']['high_pct']
-        ws.write_number(row, 1, fte_base, interactive_currency_format)
-        ws.write_number(row, 2, fte_low, interactive_currency_format)
-        ws.write_number(row, 3, fte_high, interactive_currency_format)
-        impact_score = ((fte_high - fte_low) / fte_base) * 100
-        ws.write_number(row, 4, impact_score, impact_format)
-        control_cells['fte_cost'] = f'B{row+1}'
-        range_cells['fte_cost_low'] = f'C{row+1}'
-        range_cells['fte_cost_high'] = f'D{row+1}'
-        row += 1
-        
-        # Team Size Control
-        ws.write_string(row, 0, 'Team Size (FTEs)', formats['text'])
         team_base = safe_float(base_params.get('fte_count', 2))
-        team_low = max(1, team_base * SENSITIVITY_RANGES['team_size']['low_pct'])
-        team_high = team_base * SENSITIVITY_RANGES['team_size']['high_pct']
-        ws.write_number(row, 1, team_base, interactive_format)
-        ws.write_number(row, 2, team_low, interactive_format)
-        ws.write_number(row, 3, team_high, interactive_format)
-        impact_score = ((team_high - team_low) / team_base) * 100
-        ws.write_number(row, 4, impact_score, impact_format)
-        control_cells['team_size'] = f'B{row+1}'
-        range_cells['team_size_low'] = f'C{row+1}'
-        range_cells['team_size_high'] = f'D{row+1}'
-        row += 1
-        
-        # Success Probability Control
-        ws.write_string(row, 0, 'Success Probability (%)', formats['text'])
         success_base = safe_float(base_params.get('prob_success', 80))
-        success_low = max(10, success_base + SENSITIVITY_RANGES['success_prob']['low_delta'])
-        success_high = min(95, success_base + SENSITIVITY_RANGES['success_prob']['high_delta'])
-        ws.write_number(row, 1, success_base, interactive_format)
-        ws.write_number(row, 2, success_low, interactive_format)
-        ws.write_number(row, 3, success_high, interactive_format)
-        impact_score = ((success_high - success_low) / success_base) * 100
-        ws.write_number(row, 4, impact_score, impact_format)
-        control_cells['success_prob'] = f'B{row+1}'
-        range_cells['success_prob_low'] = f'C{row+1}'
-        range_cells['success_prob_high'] = f'D{row+1}'
-        row += 1
-        
-        # Risk Factor Control
         risk_base = (safe_float(base_params.get('tech_risk', 0)) + 
                     safe_float(base_params.get('vendor_risk', 0)) + 
                     safe_float(base_params.get('market_risk', 0)))
-        risk_low = max(0, risk_base + SENSITIVITY_RANGES['risk_factor']['low_delta'])
-        risk_high = risk_base + SENSITIVITY_RANGES['risk_factor']['high_delta']
-        ws.write_string(row, 0, 'Combined Risk (%)', formats['text'])
-        ws.write_number(row, 1, risk_base, interactive_format)
-        ws.write_number(row, 2, risk_low, interactive_format)
-        ws.write_number(row, 3, risk_high, interactive_format)
-        impact_score = ((risk_high - risk_low) / max(risk_base, 1)) * 100 if risk_base > 0 else 100
-        ws.write_number(row, 4, impact_score, impact_format)
-        control_cells['risk_factor'] = f'B{row+1}'
-        range_cells['risk_factor_low'] = f'C{row+1}'
-        range_cells['risk_factor_high'] = f'D{row+1}'
-        row += 1
+        misc_base = base_params['misc_costs']
+        
+        # (key, label, current, low, high, value format) - one worksheet row per control
+        controls = [
+            ('timeline', 'Build Timeline (months)', timeline_base,
+             max(1, timeline_base * SENSITIVITY_RANGES['timeline']['low_pct']),
+             timeline_base * SENSITIVITY_RANGES['timeline']['high_pct'],
+             interactive_format),
+            ('fte_cost', 'FTE Cost (annual)', fte_base,
+             fte_base * SENSITIVITY_RANGES['fte_cost']['low_pct'],
+             fte_base * SENSITIVITY_RANGES['fte_cost']['high_pct'],
+             interactive_currency_format),
+            ('team_size', 'Team Size (FTEs)', team_base,
+             max(1, team_base * SENSITIVITY_RANGES['team_size']['low_pct']),
+             team_base * SENSITIVITY_RANGES['team_size']['high_pct'],
+             interactive_format),
+            ('success_prob', 'Success Probability (%)', success_base,
+             max(10, success_base + SENSITIVITY_RANGES['success_prob']['low_delta']),
+             min(95, success_base + SENSITIVITY_RANGES['success_prob']['high_delta']),
+             interactive_format),
+            ('risk_factor', 'Combined Risk (%)', risk_base,
+             max(0, risk_base + SENSITIVITY_RANGES['risk_factor']['low_delta']),
+             risk_base + SENSITIVITY_RANGES['risk_factor']['high_delta'],
+             interactive_format),
+            ('misc_costs', 'Misc Costs ($)', misc_base,
+             0,  # Low range (no misc costs)
+             misc_base * 2.0,
+             interactive_currency_format),
+        ]
         
-        # Miscellaneous Costs Control
-        ws.write_string(row, 0, 'Misc Costs ($)', formats['text'])
-        ws.write_number(row, 1, base_params['misc_costs'], interactive_currency_format)
-        ws.write_number(row, 2, 0, interactive_currency_format)  # Low range (no misc costs)
-        ws.write_number(row, 3, base_params['misc_costs'] * 2.0, interactive_currency_format)  # High range
-        misc_impact = (base_params['misc_costs'] * 2.0) if base_params['misc_costs'] > 0 else 0
-        ws.write_number(row, 4, misc_impact, impact_format)
-        control_cells['misc_costs'] = f'B{row+1}'
-        range_cells['misc_costs_low'] = f'C{row+1}'
-        range_cells['misc_costs_high'] = f'D{row+1}'
-        row += 2
+        for key, label, current, low, high, value_format in controls:
+            # Impact score: range width relative to the current value
+            if key == 'risk_factor':
+                impact_score = ((high - low) / max(current, 1)) * 100 if current > 0 else 100
+            elif key == 'misc_costs':
+                impact_score = high if current > 0 else 0
+            else:
+                impact_score = ((high - low) / current) * 100
+            
+            ws.write_string(row, 0, label, formats['text'])
+            ws.write_row(row, 1, [current, low, high], value_format)
+            ws.write_number(row, 4, impact_score, impact_format)
+            control_cells[key] = f'B{row+1}'
+            range_cells[f'{key}_low'] = f'C{row+1}'
+            range_cells[f'{key}_high'] = f'D{row+1}'
+            row += 1
+        row += 1
         
         # ===========================================
         # SECTION 2: REAL-TIME CALCULATION ENGINE
@@ -910,12 +1059,16 @@ class ExcelExporter:
         ws.write_string(row, 4, 'Cost Swing', formats['text_bold'])
         row += 1
         
+        def sensitivity_cost(**overrides):
+            """Sensitivity cost expression with selected control cells swapped for range cells."""
+            return self._SENSITIVITY_COST_EXPR.format_map({**control_cells, **overrides})
+        
         # Timeline sensitivity - clean label without redundant value ranges
         ws.write_string(row, 0, 'Timeline', formats['text'])
         
-        timeline_low_cost = f"=(({range_cells['timeline_low']}/12)*{control_cells['fte_cost']}*{control_cells['team_size']}/({control_cells['success_prob']}/100)+{control_cells['misc_costs']})*(1+{control_cells['risk_factor']}/100)"
-        timeline_high_cost = f"=(({range_cells['timeline_high']}/12)*{control_cells['fte_cost']}*{control_cells['team_size']}/({control_cells['success_prob']}/100)+{control_cells['misc_costs']})*(1+{control_cells['risk_factor']}/100)"
-        timeline_range_formula = f"={timeline_high_cost.replace('=', '')}-{timeline_low_cost.replace('=', '')}"
+        timeline_low_cost = "=" + sensitivity_cost(timeline=range_cells['timeline_low'])
+        timeline_high_cost = "=" + sensitivity_cost(timeline=range_cells['timeline_high'])
+        timeline_range_formula = f"={timeline_high_cost[1:]}-{timeline_low_cost[1:]}"
         
         ws.write_formula(row, 1, safe_formula(timeline_low_cost), formats['green_highlight'])
         ws.write_formula(row, 2, safe_formula(total_formula), formats['currency'])
@@ -926,9 +1079,9 @@ class ExcelExporter:
         # FTE Cost sensitivity - clean label without redundant value ranges
         ws.write_string(row, 0, 'Labor Rate', formats['text'])
         
-        fte_low_cost = f"=(({control_cells['timeline']}/12)*{range_cells['fte_cost_low']}*{control_cells['team_size']}/({control_cells['success_prob']}/100)+{control_cells['misc_costs']})*(1+{control_cells['risk_factor']}/100)"
-        fte_high_cost = f"=(({control_cells['timeline']}/12)*{range_cells['fte_cost_high']}*{control_cells['team_size']}/({control_cells['success_prob']}/100)+{control_cells['misc_costs']})*(1+{control_cells['risk_factor']}/100)"
-        fte_range_formula = f"={fte_high_cost.replace('=', '')}-{fte_low_cost.replace('=', '')}"
+        fte_low_cost = "=" + sensitivity_cost(fte_cost=range_cells['fte_cost_low'])
+        fte_high_cost = "=" + sensitivity_cost(fte_cost=range_cells['fte_cost_high'])
+        fte_range_formula = f"={fte_high_cost[1:]}-{fte_low_cost[1:]}"
         
         ws.write_formula(row, 1, safe_formula(fte_low_cost), formats['green_highlight'])
         ws.write_formula(row, 2, safe_formula(total_formula), formats['currency'])
@@ -939,9 +1092,9 @@ class ExcelExporter:
         # Team Size sensitivity - clean label without redundant value ranges
         ws.write_string(row, 0, 'Team Size', formats['text'])
         
-        team_low_cost = f"=(({control_cells['timeline']}/12)*{control_cells['fte_cost']}*{range_cells['team_size_low']}/({control_cells['success_prob']}/100)+{control_cells['misc_costs']})*(1+{control_cells['risk_factor']}/100)"
-        team_high_cost = f"=(({control_cells['timeline']}/12)*{control_cells['fte_cost']}*{range_cells['team_size_high']}/({control_cells['success_prob']}/100)+{control_cells['misc_costs']})*(1+{control_cells['risk_factor']}/100)"
-        team_range_formula = f"={team_high_cost.replace('=', '')}-{team_low_cost.replace('=', '')}"
+        team_low_cost = "=" + sensitivity_cost(team_size=range_cells['team_size_low'])
+        team_high_cost = "=" + sensitivity_cost(team_size=range_cells['team_size_high'])
+        team_range_formula = f"={team_high_cost[1:]}-{team_low_cost[1:]}"
         
         ws.write_formula(row, 1, safe_formula(team_low_cost), formats['green_highlight'])
         ws.write_formula(row, 2, safe_formula(total_formula), formats['currency'])
@@ -952,9 +1105,9 @@ class ExcelExporter:
         # Success Probability sensitivity - clean label without redundant value ranges
         ws.write_string(row, 0, 'Success Rate', formats['text'])
         
-        success_low_cost = f"=(({control_cells['timeline']}/12)*{control_cells['fte_cost']}*{control_cells['team_size']}/({range_cells['success_prob_low']}/100)+{control_cells['misc_costs']})*(1+{control_cells['risk_factor']}/100)"
-        success_high_cost = f"=(({control_cells['timeline']}/12)*{control_cells['fte_cost']}*{control_cells['team_size']}/({range_cells['success_prob_high']}/100)+{control_cells['misc_costs']})*(1+{control_cells['risk_factor']}/100)"
-        success_range_formula = f"={success_low_cost.replace('=', '')}-{success_high_cost.replace('=', '')}"
+        success_low_cost = "=" + sensitivity_cost(success_prob=range_cells['success_prob_low'])
+        success_high_cost = "=" + sensitivity_cost(success_prob=range_cells['success_prob_high'])
+        success_range_formula = f"={success_low_cost[1:]}-{success_high_cost[1:]}"
         
         ws.write_formula(row, 1, safe_formula(success_high_cost), formats['green_highlight'])
         ws.write_formula(row, 2, safe_formula(total_formula), formats['currency'])
@@ -965,9 +1118,9 @@ class ExcelExporter:
         # Risk Factor sensitivity - clean label without redundant value ranges
         ws.write_string(row, 0, 'Risk Premium', formats['text'])
         
-        risk_low_cost = f"=(({control_cells['timeline']}/12)*{control_cells['fte_cost']}*{control_cells['team_size']}/({control_cells['success_prob']}/100)+{control_cells['misc_costs']})*(1+{range_cells['risk_factor_low']}/100)"
-        risk_high_cost = f"=(({control_cells['timeline']}/12)*{control_cells['fte_cost']}*{control_cells['team_size']}/({control_cells['success_prob']}/100)+{control_cells['misc_costs']})*(1+{range_cells['risk_factor_high']}/100)"
-        risk_range_formula = f"={risk_high_cost.replace('=', '')}-{risk_low_cost.replace('=', '')}"
+        risk_low_cost = "=" + sensitivity_cost(risk_factor=range_cells['risk_factor_low'])
+        risk_high_cost = "=" + sensitivity_cost(risk_factor=range_cells['risk_factor_high'])
+        risk_range_formula = f"={risk_high_cost[1:]}-{risk_low_cost[1:]}"
         
         ws.write_formula(row, 1, safe_formula(risk_low_cost), formats['green_highlight'])
         ws.write_formula(row, 2, safe_formula(total_formula), formats['currency'])
@@ -989,9 +1142,8 @@ class ExcelExporter:
             "• All calculations update automatically when you change input values"
         ]
         
-        for instruction in instructions:
-            ws.write_string(row, 0, instruction, formats['text'])
-            row += 1
+        ws.write_column(row, 0, instructions, formats['text'])
+        row += len(instructions)
         
         row += 1
         ws.write_string(row, 0, 'Key Insights:', formats['text_bold'])
@@ -1002,9 +1154,8 @@ class ExcelExporter:
             "• Risk factors multiply the base cost, so small % changes have big impacts"
         ]
         
-        for insight in insights:
-            ws.write_string(row, 0, insight, formats['text'])
-            row += 1
+        ws.write_column(row, 0, insights, formats['text'])
+        row += len(insights)
         
         # ===========================================
         # COLUMN FORMATTING AND PROTECTION
@@ -1040,32 +1191,10 @@ class ExcelExporter:
         """Create breakeven analysis sheet with interactive controls and styling similar to sensitivity analysis."""
         ws = workbook.add_worksheet(self.BREAKEVEN_SHEET)
         
-        # Create special formats for interactive elements (consistent with sensitivity analysis)
-        interactive_format = workbook.add_format({
-            'bg_color': '#FFE6CC',  # Orange background (same as sensitivity)
-            'border': 1,
-            'align': 'center',
-            'bold': True,
-            'locked': False,  # Allow editing
-            'num_format': '0'
-        })
-        
-        interactive_currency_format = workbook.add_format({
-            'bg_color': '#FFE6CC',  # Orange background
-            'border': 1,
-            'align': 'right',
-            'bold': True,
-            'locked': False,  # Allow editing
-            'num_format': '$#,##0'
-        })
-        
-        breakeven_result_format = workbook.add_format({
-            'bg_color': '#E6F3FF',  # Light blue background (same as sensitivity)
-            'border': 1,
-            'align': 'right',
-            'bold': True,
-            'num_format': '$#,##0'
-        })
+        # Shared formats for interactive elements (consistent with sensitivity analysis)
+        interactive_format = formats['interactive']
+        interactive_currency_format = formats['interactive_currency']
+        breakeven_result_format = formats['breakeven_result']
         
         # Sheet title and description
         ws.merge_range('A1:F1', '⚖️ Breakeven Analysis - Find the Tipping Point', formats['header'])
@@ -1155,16 +1284,7 @@ class ExcelExporter:
             (1 + combined_risk/100) / 12
         )
         
-        # Use number format for timeline (months, not currency)
-        timeline_format = workbook.add_format({
-            'bg_color': '#E6F3FF',
-            'border': 1,
-            'align': 'right',
-            'bold': True,
-            'num_format': '0.0'  # Show as decimal number, not currency
-        })
-        
-        ws.write_number(row, 2, max(0, timeline_breakeven), timeline_format)
+        ws.write_number(row, 2, max(0, timeline_breakeven), formats['breakeven_number'])
         breakeven_cells['timeline'] = f'C{row+1}'
         
         timeline_change_formula = f'={breakeven_cells["timeline"]}-B{row+1}'
@@ -1203,16 +1323,7 @@ class ExcelExporter:
             (1 + combined_risk/100)
         )
         
-        # Use number format for team size (people, not currency)
-        team_format = workbook.add_format({
-            'bg_color': '#E6F3FF',
-            'border': 1,
-            'align': 'right',
-            'bold': True,
-            'num_format': '0.0'  # Show as decimal number, not currency
-        })
-        
-        ws.write_number(row, 2, max(0, team_breakeven), team_format)
+        ws.write_number(row, 2, max(0, team_breakeven), formats['breakeven_number'])
         breakeven_cells['team_size'] = f'C{row+1}'
         
         team_change_formula = f'={breakeven_cells["team_size"]}-B{row+1}'
@@ -1234,16 +1345,7 @@ class ExcelExporter:
         denominator = buy_cost - base_params['misc_costs']
         success_breakeven = safe_divide(base_labor_cost * (1 + combined_risk/100) * 100, denominator, 0.0)
         
-        # Use percentage format for success probability
-        percent_format = workbook.add_format({
-            'bg_color': '#E6F3FF',
-            'border': 1,
-            'align': 'right',
-            'bold': True,
-            'num_format': '0.0'  # Show as percentage number, not currency
-        })
-        
-        ws.write_number(row, 2, min(100, max(0, success_breakeven)), percent_format)
+        ws.write_number(row, 2, min(100, max(0, success_breakeven)), formats['breakeven_number'])
         breakeven_cells['success_prob'] = f'C{row+1}'
         
         success_change_formula = f'={breakeven_cells["success_prob"]}-B{row+1}'
@@ -1331,28 +1433,19 @@ class ExcelExporter:
         ws.write_number(row, 1, base_cost_no_risk, formats['currency'])
         row += 1
         
-        # Use percentage format for risk tolerance
-        risk_percent_format = workbook.add_format({
-            'bg_color': '#E6F3FF',
-            'border': 1,
-            'align': 'right',
-            'bold': True,
-            'num_format': '0.0'  # Show as percentage number
-        })
-        
         ws.write_string(row, 0, 'Maximum Risk Tolerance', formats['text_bold'])
-        ws.write_number(row, 1, max_allowable_risk, risk_percent_format)
+        ws.write_number(row, 1, max_allowable_risk, formats['breakeven_number'])
         ws.write_string(row, 2, '% (combined tech + vendor + market)', formats['text'])
         row += 1
         
         ws.write_string(row, 0, 'Current Risk Level', formats['text_bold'])
-        ws.write_number(row, 1, combined_risk, risk_percent_format)
+        ws.write_number(row, 1, combined_risk, formats['breakeven_number'])
         ws.write_string(row, 2, '% (current combined risk)', formats['text'])
         row += 1
         
         ws.write_string(row, 0, 'Risk Headroom', formats['text_bold'])
         risk_headroom = max_allowable_risk - combined_risk
-        ws.write_number(row, 1, risk_headroom, risk_percent_format)
+        ws.write_number(row, 1, risk_headroom, formats['breakeven_number'])
         headroom_interpretation = f'=IF({risk_headroom}>0,"Can absorb "&ROUND({risk_headroom},1)&"% more risk","Over risk limit by "&ROUND(ABS({risk_headroom}),1)&"%")'
         ws.write_formula(row, 2, safe_formula(headroom_interpretation), formats['text'])
         row += 2
@@ -1371,9 +1464,8 @@ class ExcelExporter:
             "🔄 Use orange cells to test 'what-if' scenarios in real-time"
         ]
         
-        for insight in insights:
-            ws.write_string(row, 0, insight, formats['text'])
-            row += 1
+        ws.write_column(row, 0, insights, formats['text'])
+        row += len(insights)
         
         row += 1
         ws.write_string(row, 0, 'Strategic Recommendations:', formats['text_bold'])
@@ -1386,9 +1478,8 @@ class ExcelExporter:
             "• Use scenarios to stress-test your assumptions before final decision"
         ]
         
-        for recommendation in recommendations:
-            ws.write_string(row, 0, recommendation, formats['text'])
-            row += 1
+        ws.write_column(row, 0, recommendations, formats['text'])
+        row += len(recommendations)
         
         # ===========================================
         # COLUMN FORMATTING AND PROTECTION
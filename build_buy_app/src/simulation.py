@@ -2,9 +2,116 @@
 Simulation Engine for Build vs Buy Analysis
 Extracted from Jupyter notebook for production use
 """
+import hashlib
+import inspect
+import logging
 import numpy as np
 from typing import Dict, Any, List
 
+from .utils import annuity_factor
+
+logger = logging.getLogger(__name__)
+
+
+def _labor_pv_kernel(nominal_labor: np.ndarray, timeline_samples: np.ndarray, wacc: float, out: np.ndarray) -> np.ndarray:
+    """
+    Discount each sample's labor cost year by year at mid-year timing.
+    
+    Written as a plain Python loop so it runs unchanged without numba; see
+    _load_labor_pv for how a compiled version is chosen. It is deliberately serial:
+    Dash serves callbacks from threads, and numba's fallback threading layer
+    (workqueue, used when neither TBB nor OpenMP is installed) aborts the
+    process when two threads enter a parallel=True kernel at once.
+    
+    tools/build_native_kernel.py compiles this function into the optional
+    src/_simulation_native extension. After editing it, rebuild with
+    `python tools/build_native_kernel.py`; a stale build is detected and ignored.
+    
+    Args:
+        nominal_labor: Success-adjusted labor cost per sample
+        timeline_samples: Build timeline per sample (months)
+        wacc: Annual discount rate as a decimal
+        out: Preallocated output array, filled in place
+        
+    Returns:
+        out, holding the present value of labor cost per sample
+    """
+    n = nominal_labor.shape[0]
+    
+    for i in range(n):
+        labor_cost = nominal_labor[i]
+        timeline_years = timeline_samples[i] / 12
+        
+        if timeline_years <= 1:
+            # Single year: cost occurs at midpoint of year (6 months)
+            pv = labor_cost / ((1 + wacc) ** 0.5)
+        else:
+            # Multi-year: distribute costs and discount year by year
+            pv = 0.0
+            years_full = int(timeline_years)
+            remaining_fraction = timeline_years - years_full
+            
+            # Full years: assume costs occur at midpoint of each year
+            cost_per_year = labor_cost / timeline_years
+            for year in range(years_full):
+                year_midpoint = year + 0.5
+                pv += cost_per_year / ((1 + wacc) ** year_midpoint)
+            
+            # Partial year: assume costs occur at midpoint of partial year
+            if remaining_fraction > 0:
+                partial_year_cost = cost_per_year * remaining_fraction
+                partial_year_midpoint = years_full + (remaining_fraction / 2)
+                pv += partial_year_cost / ((1 + wacc) ** partial_year_midpoint)
+        
+        out[i] = pv
+    
+    return out
+
+
+def _kernel_source_hash() -> int:
+    """Hash of the labor PV kernel source, stamped into the AOT build to detect stale extensions."""
+    source = inspect.getsource(_labor_pv_kernel)
+    return int(hashlib.sha256(source.encode()).hexdigest()[:15], 16)
+
+
+def _load_labor_pv():
+    """
+    Pick the fastest available labor PV implementation.
+    
+    Prefers the ahead-of-time _simulation_native extension, which needs no
+    numba at runtime. numba is only imported when that extension is missing
+    or stale, to JIT the kernel; without numba the plain Python loop is used.
+    
+    Returns:
+        Callable with the _labor_pv_kernel signature
+    """
+    try:
+        # Ahead-of-time build from tools/build_native_kernel.py, when present
+        from . import _simulation_native
+    except ImportError:
+        _simulation_native = None
+    
+    if _simulation_native is not None:
+        if getattr(_simulation_native, 'source_hash', lambda: None)() == _kernel_source_hash():
+            logger.debug("Labor PV kernel: ahead-of-time _simulation_native extension")
+            return _simulation_native.labor_pv
+        logger.warning(
+            "_simulation_native was built from a different _labor_pv_kernel; "
+            "ignoring it. Rebuild with `python tools/build_native_kernel.py`."
+        )
+    
+    try:
+        from numba import njit
+    except ImportError:  # numba is optional - fall back to the plain Python loop
+        logger.debug("Labor PV kernel: plain Python (numba not installed)")
+        return _labor_pv_kernel
+    
+    logger.debug("Labor PV kernel: numba JIT")
+    return njit(cache=True)(_labor_pv_kernel)
+
+
+_labor_pv = _load_labor_pv()
+
 
 class BuildVsBuySimulator:
     """
@@ -33,7 +140,9 @@ class BuildVsBuySimulator:
         Returns:
             Dictionary containing simulation results
         """
-        np.random.seed(self.random_seed)
+        # Fresh PCG64 stream per run so repeated calls stay reproducible. It is
+        # local, not instance state, because one simulator serves concurrent requests.
+        rng = np.random.default_rng(self.random_seed)
         
         # Extract and validate parameters
         core_params = self._extract_core_parameters(params)
@@ -43,7 +152,7 @@ class BuildVsBuySimulator:
         
         # Run Monte Carlo simulation for build costs
         build_cost_distribution = self._simulate_build_costs(
-            core_params, risk_params, cost_params
+            core_params, risk_params, cost_params, rng
         )
         
         # Calculate buy costs (deterministic)
@@ -105,20 +214,27 @@ class BuildVsBuySimulator:
             'buy_selector': params.get('buy_selector', [])
         }
     
-    def _simulate_build_costs(self, core_params: Dict, risk_params: Dict, cost_params: Dict) -> np.ndarray:
+    def _simulate_build_costs(self, core_params: Dict, risk_params: Dict, cost_params: Dict,
+                              rng: np.random.Generator) -> np.ndarray:
         """Simulate build costs using Monte Carlo method with improved PV calculations."""
         n_sim = self.n_simulations
         
+        # All random inputs come from one bulk draw, one contiguous row per input.
+        # An input without a row is deterministic; consumers never re-check that.
+        draws = self._draw_standard_normals(core_params, risk_params, cost_params, n_sim, rng)
+        
         # Simulate timeline and FTE cost uncertainty
         timeline_samples = self._generate_samples(
             core_params['build_timeline'], 
             core_params['build_timeline_std'], 
-            n_sim
+            n_sim,
+            draws.get('build_timeline')
         )
         fte_cost_samples = self._generate_samples(
             core_params['fte_cost'],
             core_params['fte_cost_std'],
-            n_sim
+            n_sim,
+            draws.get('fte_cost')
         )
         
         # Calculate nominal labor cost over timeline
@@ -138,19 +254,51 @@ class BuildVsBuySimulator:
         total_cost_pv = labor_cost_pv
         total_cost_pv += cost_params['capex']  # CapEx (immediate, Year 0)
         total_cost_pv += self._calculate_amortization_pv(cost_params['amortization'], timeline_samples, core_params['wacc'])
-        total_cost_pv += self._calculate_opex_pv(cost_params, core_params, n_sim)
+        total_cost_pv += self._calculate_opex_pv(cost_params, core_params, n_sim, draws.get('maint_opex'))
         total_cost_pv += core_params['misc_costs']  # Miscellaneous (immediate, Year 0)
         
         # Apply risk factors to base costs (before any additional adjustments)
-        total_cost_pv = self._apply_risk_factors(total_cost_pv, risk_params, n_sim)
+        total_cost_pv = self._apply_risk_factors(total_cost_pv, risk_params, n_sim, draws.get('risk'))
         
         # Clean up any invalid values
         return self._clean_samples(total_cost_pv)
     
-    def _generate_samples(self, mean: float, std: float, n_sim: int) -> np.ndarray:
-        """Generate samples with uncertainty, handling edge cases."""
-        if std > 0:
-            samples = np.random.normal(mean, std, n_sim)
+    def _draw_standard_normals(self, core_params: Dict, risk_params: Dict, cost_params: Dict, n_sim: int,
+                               rng: np.random.Generator) -> Dict[str, np.ndarray]:
+        """
+        Draw every standard normal the simulation needs in a single call.
+        
+        This is the only place that decides which inputs are stochastic. Each
+        one gets a row, in the order the inputs are consumed, so the stream
+        matches drawing them one by one. Consumers treat a missing row as
+        "deterministic" instead of re-deriving the conditions.
+        
+        Args:
+            core_params: Core simulation parameters
+            risk_params: Risk factor percentages
+            cost_params: Optional cost parameters
+            n_sim: Number of samples per input
+            rng: Generator for this simulate() call
+            
+        Returns:
+            Dictionary mapping input name to its row of n_sim draws
+        """
+        total_risk_percent = sum(risk_params.get(key, 0) for key in ('tech_risk', 'vendor_risk', 'market_risk'))
+        active = [name for name, needed in (
+            ('build_timeline', core_params['build_timeline_std'] > 0),
+            ('fte_cost', core_params['fte_cost_std'] > 0),
+            ('maint_opex', cost_params['maint_opex'] > 0 and cost_params['maint_opex_std'] > 0),
+            ('risk', total_risk_percent > 0 and n_sim > 1),
+        ) if needed]
+        
+        if not active:
+            return {}
+        return dict(zip(active, rng.standard_normal((len(active), n_sim))))
+    
+    def _generate_samples(self, mean: float, std: float, n_sim: int, z: np.ndarray = None) -> np.ndarray:
+        """Generate samples around mean from standard normals z, or a constant when z is None."""
+        if z is not None:
+            samples = mean + std * z
             # Remove negative values
             samples = np.where(samples <= 0, mean, samples)
         else:
@@ -159,35 +307,14 @@ class BuildVsBuySimulator:
     
     def _calculate_labor_pv_year_by_year(self, nominal_labor: np.ndarray, timeline_samples: np.ndarray, wacc: float) -> np.ndarray:
         """Calculate present value of labor costs with year-by-year discounting."""
-        labor_pv = np.zeros_like(nominal_labor)
-        
-        for i, (labor_cost, timeline_months) in enumerate(zip(nominal_labor, timeline_samples)):
-            timeline_years = timeline_months / 12
-            
-            if timeline_years <= 1:
-                # Single year: cost occurs at midpoint of year (6 months)
-                pv = labor_cost / ((1 + wacc) ** 0.5)
-            else:
-                # Multi-year: distribute costs and discount year by year
-                pv = 0.0
-                years_full = int(timeline_years)
-                remaining_fraction = timeline_years - years_full
-                
-                # Full years: assume costs occur at midpoint of each year
-                cost_per_year = labor_cost / timeline_years
-                for year in range(years_full):
-                    year_midpoint = year + 0.5
-                    pv += cost_per_year / ((1 + wacc) ** year_midpoint)
-                
-                # Partial year: assume costs occur at midpoint of partial year
-                if remaining_fraction > 0:
-                    partial_year_cost = cost_per_year * remaining_fraction
-                    partial_year_midpoint = years_full + (remaining_fraction / 2)
-                    pv += partial_year_cost / ((1 + wacc) ** partial_year_midpoint)
-            
-            labor_pv[i] = pv
-        
-        return labor_pv
+        # Fresh output per call: callers add to it in place, and one simulator
+        # instance serves concurrent requests
+        return _labor_pv(
+            np.asarray(nominal_labor, dtype=np.float64),
+            np.asarray(timeline_samples, dtype=np.float64),
+            float(wacc),
+            np.empty(len(nominal_labor))
+        )
     
     def _calculate_amortization_pv(self, amortization: float, timeline_samples: np.ndarray, wacc: float) -> np.ndarray:
         """Calculate present value of amortization over build timeline."""
@@ -197,15 +324,18 @@ class BuildVsBuySimulator:
         # Convert annual WACC to monthly rate correctly
         monthly_rate = (1 + wacc) ** (1/12) - 1
         
-        amortization_pv = np.zeros(len(timeline_samples))
-        for i, timeline in enumerate(timeline_samples):
-            months = int(np.round(timeline))
-            pv = sum(amortization / ((1 + monthly_rate) ** m) for m in range(1, months + 1))
-            amortization_pv[i] = pv
+        # Cumulative monthly discount factors: cumulative_factors[n] is the PV of
+        # n monthly payments of 1, so each sample is a single lookup
+        months = np.round(timeline_samples).astype(int)
+        max_months = max(int(months.max()), 0)
+        cumulative_factors = np.concatenate((
+            [0.0],
+            np.cumsum(np.power(1 + monthly_rate, -np.arange(1, max_months + 1, dtype=float)))
+        ))
         
-        return amortization_pv
+        return amortization * cumulative_factors[np.clip(months, 0, None)]
     
-    def _calculate_opex_pv(self, cost_params: Dict, core_params: Dict, n_sim: int) -> np.ndarray:
+    def _calculate_opex_pv(self, cost_params: Dict, core_params: Dict, n_sim: int, z: np.ndarray = None) -> np.ndarray:
         """Calculate present value of operational expenses."""
         maint_opex = cost_params['maint_opex']
         if maint_opex <= 0:
@@ -215,21 +345,18 @@ class BuildVsBuySimulator:
         opex_samples = self._generate_samples(
             maint_opex,
             cost_params['maint_opex_std'],
-            n_sim
+            n_sim,
+            z
         )
         
-        # Calculate present value over useful life
-        opex_pv = np.zeros(n_sim)
-        useful_life = int(np.round(core_params['useful_life']))
-        wacc = core_params['wacc']
-        
-        for i, opex in enumerate(opex_samples):
-            pv = sum(opex / ((1 + wacc) ** y) for y in range(1, useful_life + 1))
-            opex_pv[i] = pv
+        # Calculate present value over useful life: the discount factor is
+        # identical for every sample, so compute it once and scale. A life of
+        # zero or less has no maintenance years (the closed form would go negative).
+        useful_life = max(int(np.round(core_params['useful_life'])), 0)
         
-        return opex_pv
+        return opex_samples * annuity_factor(core_params['wacc'], useful_life)
     
-    def _apply_risk_factors(self, costs: np.ndarray, risk_params: Dict, n_sim: int) -> np.ndarray:
+    def _apply_risk_factors(self, costs: np.ndarray, risk_params: Dict, n_sim: int, z: np.ndarray = None) -> np.ndarray:
         """Apply risk factors as multiplicative adjustments with more conservative modeling."""
         # Calculate total risk percentage (additive)
         total_risk_percent = (
@@ -246,9 +373,10 @@ class BuildVsBuySimulator:
         risk_multiplier = 1 + (total_risk_percent / 100)
         
         # For Monte Carlo variation, add small stochastic component
-        if n_sim > 1:
+        # (z is None when _draw_standard_normals left risk deterministic)
+        if z is not None:
             # Small random variation around the base multiplier (±5% relative)
-            risk_variation = np.random.normal(0, 0.05, n_sim)
+            risk_variation = 0.05 * z
             risk_multipliers = risk_multiplier * (1 + risk_variation)
             risk_multipliers = np.clip(risk_multipliers, 1.0, None)  # Ensure >= 1.0
         else:
@@ -274,10 +402,9 @@ class BuildVsBuySimulator:
             
             # Calculate NPV of subscription payments
             # Use 1-based indexing to match Excel: payments in years 1,2,3,4,5 for 5-year life
-            for year in range(1, useful_life + 1):
-                payment = subscription_price * ((1 + subscription_increase) ** (year - 1))
-                pv = payment / ((1 + wacc) ** year)  # Discount to present value
-                buy_total_cost += pv
+            years = np.arange(1, useful_life + 1, dtype=float)
+            payments = subscription_price * np.power(1 + subscription_increase, years - 1)
+            buy_total_cost += float(np.sum(payments * np.power(1 + wacc, -years)))  # Discount to present value
         
         return buy_total_cost
     
@@ -4,6 +4,8 @@ Utility functions for the Build vs Buy Dashboard
 import re
 from typing import Any, Union
 
+import numpy as np
+
 
 def safe_float(value: Any, default: float = 0.0) -> float:
     """
@@ -60,6 +62,32 @@ def validate_numeric_range(value: float, min_val: float, max_val: float) -> bool
     return min_val <= value <= max_val
 
 
+def annuity_factor(rate: Union[float, np.ndarray], periods: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+    """
+    Present value of 1 paid at the end of each period: (1 - (1+rate)^-periods) / rate.
+    
+    Broadcasts like any NumPy expression, so a whole grid of rates and lives is
+    a single call, e.g. annuity_factor(rates[:, None], lives[None, :]).
+    
+    Args:
+        rate: Discount rate per period as a decimal (scalar or array)
+        periods: Number of periods (scalar or array), >= 0; the closed form
+            is negative for negative periods, so callers clamp first
+        
+    Returns:
+        Annuity factor as a float for scalar inputs, otherwise an array
+    """
+    rate = np.asarray(rate, dtype=float)
+    periods = np.asarray(periods, dtype=float)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        factor = (1 - np.power(1 + rate, -periods)) / rate
+    # A zero rate means no discounting: the factor is just the number of periods
+    factor = np.where(rate == 0, periods, factor)
+    
+    return float(factor) if factor.ndim == 0 else factor
+
+
 def format_currency(amount: float) -> str:
     """
     Format a number as currency string.
@@ -0,0 +1,34 @@
+"""
+Shared pytest fixtures for the Build vs Buy test suite
+"""
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+@pytest.fixture(scope='session')
+def exporter():
+    """Excel exporter shared across the test session."""
+    from core.excel_export import ExcelExporter
+    return ExcelExporter()
+
+
+@pytest.fixture(scope='session')
+def build_buy_app():
+    """Dashboard app shared across the test session.
+    
+    Importing app.py already builds a module-level BuildVsBuyApp for Gunicorn,
+    so reuse that instance instead of registering every callback again.
+    """
+    from app import app
+    return app
+
+
+@pytest.fixture(scope='session')
+def simulator():
+    """Seeded simulator shared across the test session."""
+    from src.simulation import BuildVsBuySimulator
+    return BuildVsBuySimulator(n_simulations=1000, random_seed=42)
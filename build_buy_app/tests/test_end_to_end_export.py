@@ -11,16 +11,15 @@ from io import BytesIO
 # Add the parent directory to the path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from app import BuildVsBuyApp
 from src.simulation import BuildVsBuySimulator
 
 
-def test_complete_workflow():
+def test_complete_workflow(build_buy_app):
     """Test the complete workflow from scenario creation to Excel export."""
     print("🧪 Testing complete multi-scenario workflow...")
     
     # Initialize the app
-    app_instance = BuildVsBuyApp()
+    app_instance = build_buy_app
     
     # Create test scenarios with different parameters
     test_scenarios = []
@@ -137,11 +136,11 @@ def test_complete_workflow():
     print("✅ Complete workflow test passed!")
 
 
-def test_edge_cases():
+def test_edge_cases(build_buy_app):
     """Test edge cases and error handling."""
     print("🧪 Testing edge cases...")
     
-    app_instance = BuildVsBuyApp()
+    app_instance = build_buy_app
     
     # Test with empty scenarios
     empty_exports = app_instance.excel_exporter.create_multiple_scenario_exports([])
@@ -177,11 +176,11 @@ def test_edge_cases():
     print("✅ Edge cases test passed!")
 
 
-def test_user_experience_scenarios():
+def test_user_experience_scenarios(build_buy_app):
     """Test realistic user scenarios."""
     print("🧪 Testing realistic user scenarios...")
     
-    app_instance = BuildVsBuyApp()
+    app_instance = build_buy_app
     
     # Scenario: User has 1 saved scenario (should get single Excel file)
     single_scenario = [{
@@ -237,9 +236,11 @@ if __name__ == "__main__":
     print("=" * 70)
     
     try:
-        test_complete_workflow()
-        test_edge_cases()
-        test_user_experience_scenarios()
+        from app import app as build_buy_app
+        
+        test_complete_workflow(build_buy_app)
+        test_edge_cases(build_buy_app)
+        test_user_experience_scenarios(build_buy_app)
         
         print("=" * 70)
         print("🎉 ALL END-TO-END TESTS PASSED!")
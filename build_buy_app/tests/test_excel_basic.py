@@ -7,7 +7,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from core.excel_export import ExcelExporter
 
-def test_excel_basic():
+def test_excel_basic(exporter):
     """Test basic Excel export functionality."""
     
     test_params = {
@@ -32,7 +32,6 @@ def test_excel_basic():
     print("Testing basic Excel export...")
     
     try:
-        exporter = ExcelExporter()
         excel_bytes = exporter.create_excel_export(test_params)
         
         if excel_bytes:
@@ -49,7 +48,7 @@ def test_excel_basic():
         return False
 
 if __name__ == "__main__":
-    success = test_excel_basic()
+    success = test_excel_basic(ExcelExporter())
     if success:
         print("Excel export is working!")
     else:
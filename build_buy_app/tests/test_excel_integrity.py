@@ -3,13 +3,13 @@ Test to validate Excel file integrity and formula syntax
 """
 import sys
 import os
+from io import BytesIO
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from core.excel_export import ExcelExporter
-import tempfile
 
 
-def test_excel_file_integrity():
+def test_excel_file_integrity(exporter):
     """Test that Excel file can be created without corruption."""
     
     # Sample scenario that matches what user was testing
@@ -31,29 +31,18 @@ def test_excel_file_integrity():
     }
     
     try:
-        exporter = ExcelExporter()
         excel_data = exporter.create_excel_export(test_scenario)
         
         # Check that we got data
         assert excel_data is not None, "Excel export returned None"
         assert len(excel_data) > 0, "Excel export returned empty data"
         
-        # Save to temporary file to test file integrity
-        with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as temp_file:
-            temp_file.write(excel_data)
-            temp_filename = temp_file.name
-        
-        # Check file size is reasonable
-        file_size = os.path.getsize(temp_filename)
-        assert file_size > 5000, f"Excel file too small: {file_size} bytes"
-        assert file_size < 100000, f"Excel file too large: {file_size} bytes"
+        # Check file size is reasonable (no need to round-trip through disk)
+        file_size = len(excel_data)
+        assert 5000 < file_size < 100000, f"Excel file size out of range: {file_size} bytes"
         
         print("✅ Excel file integrity test PASSED")
         print(f"   File size: {file_size:,} bytes")
-        print(f"   Temp file: {temp_filename}")
-        
-        # Clean up
-        os.unlink(temp_filename)
         
         return True
         
@@ -64,7 +53,7 @@ def test_excel_file_integrity():
         return False
 
 
-def test_formula_safety():
+def test_formula_safety(exporter):
     """Test that formulas are properly escaped and safe."""
     
     # Test edge case that might cause formula issues
@@ -80,7 +69,6 @@ def test_formula_safety():
     }
     
     try:
-        exporter = ExcelExporter()
         excel_data = exporter.create_excel_export(edge_scenario)
         
         assert excel_data is not None
@@ -96,15 +84,81 @@ def test_formula_safety():
         return False
 
 
+def test_export_cache(exporter):
+    """Test that unchanged scenarios reuse the cached workbook and changed ones rebuild."""
+    
+    scenario = {
+        'build_timeline': 9,
+        'fte_cost': 140000,
+        'fte_count': 3,
+        'prob_success': 85,
+        'wacc': 7,
+        'useful_life': 4,
+        'product_price': 400000,
+        'buy_selector': ['one_time']
+    }
+    
+    first = exporter.create_excel_export(scenario)
+    # The download callback stamps a fresh name/timestamp and attaches results on
+    # every click; none of them are written to the workbook, so they must not defeat the cache
+    second = ExcelExporter().create_excel_export(dict(
+        scenario,
+        name='Renamed',
+        timestamp='20250101_120000',
+        results={'expected_build_cost': 1.0}
+    ))
+    changed = exporter.create_excel_export(dict(scenario, fte_count=4))
+    
+    assert first is not None and changed is not None
+    assert second is first, "Unchanged scenario should be served from the export cache"
+    assert changed != first, "Changed parameters should produce a new workbook"
+    
+    # Absent fields fall back to the builders' defaults, so an explicit None is a different workbook
+    defaults = exporter.create_excel_export({})
+    for key in ('tech_risk', 'maint_escalation'):
+        explicit_none = exporter.create_excel_export({key: None})
+        assert explicit_none is not defaults, f"Explicit None for {key} should not reuse the defaults workbook"
+    
+    print("✅ Export cache test PASSED")
+
+
+def test_export_cache_key_covers_workbook_inputs(exporter):
+    """Test that every field the sheet builders read is part of the export cache key."""
+    from core.excel_export import _ReadTracker, _WORKBOOK_INPUT_KEYS
+    
+    scenario = _ReadTracker({
+        'build_timeline': 30,
+        'fte_cost': 150000,
+        'fte_count': 3,
+        'tech_risk': 10,
+        'maint_opex': 20000,
+        'capex': 100000,
+        'amortization': 2000,
+        'product_price': 500000,
+        'subscription_price': 12000,
+        'subscription_increase': 3,
+        'buy_selector': ['one_time', 'subscription']
+    })
+    exporter._write_xlsx_to_stream(scenario, BytesIO())
+    
+    unkeyed = scenario.read_keys - set(_WORKBOOK_INPUT_KEYS)
+    assert not unkeyed, f"Add these fields to _WORKBOOK_INPUT_KEYS: {sorted(unkeyed)}"
+    
+    print("✅ Export cache key coverage test PASSED")
+
+
 if __name__ == "__main__":
     print("🔍 Testing Excel File Integrity and Formula Safety...")
     print("=" * 60)
     
     success = True
+    exporter = ExcelExporter()
     
     # Run tests
-    success &= test_excel_file_integrity()
-    success &= test_formula_safety()
+    success &= test_excel_file_integrity(exporter)
+    success &= test_formula_safety(exporter)
+    test_export_cache(exporter)
+    test_export_cache_key_covers_workbook_inputs(exporter)
     
     print("=" * 60)
     if success:
@@ -0,0 +1,48 @@
+"""
+Tests for the modern UI layout and its stylesheet
+Run with: python -m pytest tests/test_modern_ui.py
+"""
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def _iter_components(component):
+    """Yield a component and every component nested in its children."""
+    yield component
+    children = getattr(component, 'children', None)
+    if not isinstance(children, (list, tuple)):
+        children = [children]
+    for child in children:
+        if hasattr(child, 'to_plotly_json'):  # Skip text and empty children
+            yield from _iter_components(child)
+
+
+def test_checklist_icons_styled(build_buy_app):
+    """Test that every checklist option label has an icon rule in assets/modern_ui.css."""
+    css_path = os.path.join(os.path.dirname(__file__), '..', 'assets', 'modern_ui.css')
+    with open(css_path) as css_file:
+        css = css_file.read()
+    
+    layout = build_buy_app.modern_ui.create_modern_layout()
+    label_ids = [
+        option['label_id']
+        for component in _iter_components(layout)
+        for option in (getattr(component, 'options', None) or [])
+        if isinstance(option, dict) and 'label_id' in option
+    ]
+    assert label_ids, "Checklist options should carry label ids for their icons"
+    
+    for label_id in label_ids:
+        assert f"#{label_id}::before {{ content:" in css, f"No icon rule for checklist option '{label_id}'"
+    
+    print("✅ Checklist icon styles test passed")
+
+
+if __name__ == "__main__":
+    print("🧪 Running modern UI tests...")
+    print("=" * 50)
+    
+    from app import app as build_buy_app
+    
+    test_checklist_icons_styled(build_buy_app)
@@ -6,6 +6,7 @@ import sys
 import os
 import tempfile
 import zipfile
+from collections import ChainMap
 from io import BytesIO
 
 # Add the parent directory to the path
@@ -15,10 +16,25 @@ from core.excel_export import ExcelExporter
 from src.simulation import BuildVsBuySimulator
 
 
+# Set FAST_TESTS=1 to skip the simulator and attach a fixed results dict;
+# the exporter never reads scenario['results'], so the output is identical.
+FAST_TESTS = os.environ.get('FAST_TESTS') == '1'
+
+FIXED_RESULTS = {
+    'expected_build_cost': 0.0,
+    'build_cost_p10': 0.0,
+    'build_cost_p50': 0.0,
+    'build_cost_p90': 0.0,
+    'risk_adjusted_cost': 0.0,
+    'buy_total_cost': 0.0,
+    'npv_difference': 0.0,
+    'recommendation': 'Buy',
+    'cost_distribution': []
+}
+
+
 def create_test_scenario(name, build_timeline=12, fte_cost=150000, fte_count=2):
     """Create a test scenario with simulation results."""
-    simulator = BuildVsBuySimulator(n_simulations=10)  # Small for testing
-    
     params = {
         'build_timeline': build_timeline,
         'fte_cost': fte_cost,
@@ -30,31 +46,27 @@ def create_test_scenario(name, build_timeline=12, fte_cost=150000, fte_count=2):
         'buy_selector': ['one_time']
     }
     
-    results = simulator.simulate(params)
+    if FAST_TESTS:
+        results = dict(FIXED_RESULTS)
+    else:
+        simulator = BuildVsBuySimulator(n_simulations=10)  # Small for testing
+        results = simulator.simulate(params)
     
-    scenario = {
+    # Overlay the scenario-only keys on the simulation params without copying them
+    scenario = ChainMap({
         'name': name,
-        'build_timeline': build_timeline,
-        'fte_cost': fte_cost,
-        'fte_count': fte_count,
-        'useful_life': 5,
-        'prob_success': 80,
-        'wacc': 8,
-        'product_price': 500000,
-        'buy_selector': ['one_time'],
         'risk_selector': [],
         'cost_selector': [],
         'results': results
-    }
+    }, params)
     
     return scenario
 
 
-def test_single_scenario_export():
+def test_single_scenario_export(exporter):
     """Test exporting a single scenario."""
     print("🧪 Testing single scenario export...")
     
-    exporter = ExcelExporter()
     scenario = create_test_scenario("Test_Single_Scenario")
     
     # Test single scenario export
@@ -66,12 +78,10 @@ def test_single_scenario_export():
     print("✅ Single scenario export test passed")
 
 
-def test_multiple_scenario_exports():
+def test_multiple_scenario_exports(exporter):
     """Test creating multiple Excel files from scenarios."""
     print("🧪 Testing multiple scenario exports...")
     
-    exporter = ExcelExporter()
-    
     # Create test scenarios
     scenarios = [
         create_test_scenario("Project_Alpha", 12, 150000, 2),
@@ -101,12 +111,10 @@ def test_multiple_scenario_exports():
     print("✅ Multiple scenario exports test passed")
 
 
-def test_zip_creation():
+def test_zip_creation(exporter):
     """Test creating ZIP file with multiple scenarios."""
     print("🧪 Testing ZIP file creation...")
     
-    exporter = ExcelExporter()
-    
     # Create test scenarios
     scenarios = [
         create_test_scenario("Scenario_One", 12, 150000, 2),
@@ -130,21 +138,51 @@ def test_zip_creation():
             assert filename.endswith('.xlsx'), f"File should be Excel: {filename}"
             assert 'BuildVsBuyAnalysis' in filename, f"Filename should contain 'BuildVsBuyAnalysis': {filename}"
         
+        # Workbooks are already compressed, so the archive should not deflate them again
+        for info in zip_file.infolist():
+            assert info.compress_type == zipfile.ZIP_STORED, f"{info.filename} should be stored, not recompressed"
+        
         # Test that files can be extracted and have content
         for filename in file_list:
             with zip_file.open(filename) as excel_file:
                 excel_content = excel_file.read()
                 assert len(excel_content) > 1000, f"Excel file {filename} should have content"
+                
+                # Members must be the same standard package as a single export (no data descriptors)
+                with zipfile.ZipFile(BytesIO(excel_content)) as workbook_zip:
+                    for part in workbook_zip.infolist():
+                        assert not part.flag_bits & 0x8, f"{filename}:{part.filename} should not use a data descriptor"
     
     print("✅ ZIP creation test passed")
 
 
-def test_filename_sanitization():
+def test_zip_skips_failed_scenario(exporter):
+    """Test that one scenario failing to render does not drop the rest of the ZIP."""
+    print("🧪 Testing ZIP fault isolation...")
+    
+    scenarios = [
+        create_test_scenario("Scenario_One", 12, 150000, 2),
+        create_test_scenario(None, 15, 160000, 3),  # Name cannot be turned into a filename
+        create_test_scenario("Scenario_Three", 18, 170000, 4)
+    ]
+    
+    zip_data = exporter.create_scenarios_zip(scenarios)
+    assert zip_data is not None, "ZIP should still be created when one scenario fails"
+    
+    with zipfile.ZipFile(BytesIO(zip_data), 'r') as zip_file:
+        file_list = zip_file.namelist()
+    
+    assert len(file_list) == 2, f"ZIP should contain the 2 good scenarios, got {len(file_list)}"
+    assert any(name.startswith("Scenario_One") for name in file_list)
+    assert any(name.startswith("Scenario_Three") for name in file_list)
+    
+    print("✅ ZIP fault isolation test passed")
+
+
+def test_filename_sanitization(exporter):
     """Test that problematic characters in scenario names are handled."""
     print("🧪 Testing filename sanitization...")
     
-    exporter = ExcelExporter()
-    
     # Create scenarios with problematic names
     scenarios = [
         create_test_scenario("Project/With\\Slashes", 12, 150000, 2),
@@ -173,12 +211,10 @@ def test_filename_sanitization():
     print("✅ Filename sanitization test passed")
 
 
-def test_empty_scenarios():
+def test_empty_scenarios(exporter):
     """Test handling of empty scenario list."""
     print("🧪 Testing empty scenarios handling...")
     
-    exporter = ExcelExporter()
-    
     # Test empty list
     exports = exporter.create_multiple_scenario_exports([])
     assert exports == [], "Empty scenarios should return empty list"
@@ -190,13 +226,12 @@ def test_empty_scenarios():
     print("✅ Empty scenarios handling test passed")
 
 
-def test_app_integration():
+def test_app_integration(build_buy_app):
     """Test that the app can be imported and the new functionality works."""
     print("🧪 Testing app integration...")
     
     try:
-        from app import BuildVsBuyApp
-        app_instance = BuildVsBuyApp()
+        app_instance = build_buy_app
         
         # Verify the app still works
         assert app_instance.app is not None, "App should initialize successfully"
@@ -220,12 +255,15 @@ if __name__ == "__main__":
     print("=" * 60)
     
     try:
-        test_single_scenario_export()
-        test_multiple_scenario_exports()
-        test_zip_creation()
-        test_filename_sanitization()
-        test_empty_scenarios()
-        test_app_integration()
+        exporter = ExcelExporter()
+        test_single_scenario_export(exporter)
+        test_multiple_scenario_exports(exporter)
+        test_zip_creation(exporter)
+        test_zip_skips_failed_scenario(exporter)
+        test_filename_sanitization(exporter)
+        test_empty_scenarios(exporter)
+        from app import app as build_buy_app
+        test_app_integration(build_buy_app)
         
         print("=" * 60)
         print("🎉 ALL MULTI-SCENARIO EXPORT TESTS PASSED!")
@@ -4,15 +4,116 @@ This test validates that Excel formulas match simulation logic without requiring
 """
 import sys
 import os
-import tempfile
+import zipfile
+from io import BytesIO
+import xml.etree.ElementTree as ET
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from src.simulation import BuildVsBuySimulator
-from core.excel_export import ExcelExporter
-from openpyxl import load_workbook
+# SpreadsheetML namespaces used by the raw XML readers below
+XLSX_NS = {
+    'main': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main',
+    'rel': 'http://schemas.openxmlformats.org/package/2006/relationships',
+}
+XLSX_REL_ID = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id'
+
+# Step-by-step report is skipped on CI; the pass/fail verdict is always written
+VERBOSE = not os.environ.get('CI')
+
+
+def _read_xlsx_defined_names(xlsx_file):
+    """
+    Read workbook-level defined names straight from xl/workbook.xml.
+    
+    Args:
+        xlsx_file: Path or binary file object of the workbook
+        
+    Returns:
+        dict: {name: (sheet_title, coord)} with '$' anchors stripped
+    """
+    with zipfile.ZipFile(xlsx_file) as package:
+        workbook = ET.fromstring(package.read('xl/workbook.xml'))
+    
+    names = {}
+    for defined_name in workbook.iterfind('main:definedNames/main:definedName', XLSX_NS):
+        sheet_title, _, coord = defined_name.text.rpartition('!')
+        names[defined_name.get('name')] = (sheet_title.strip("'"), coord.replace('$', ''))
+    return names
+
+
+def _read_xlsx_cells(xlsx_file, sheet_title):
+    """
+    Read one worksheet's cells straight from the package XML, skipping openpyxl.
+    
+    Handles shared strings as well as inline strings, so it does not depend
+    on how the writer stores text.
+    
+    Args:
+        xlsx_file: Path or binary file object of the workbook
+        sheet_title: Worksheet name as shown on its tab
+        
+    Returns:
+        dict: {coord: value} where formulas are returned as '=...' text
+    """
+    with zipfile.ZipFile(xlsx_file) as package:
+        workbook = ET.fromstring(package.read('xl/workbook.xml'))
+        rels = ET.fromstring(package.read('xl/_rels/workbook.xml.rels'))
+        targets = {rel.get('Id'): rel.get('Target') for rel in rels.iterfind('rel:Relationship', XLSX_NS)}
+        
+        sheet_path = None
+        for sheet in workbook.iterfind('main:sheets/main:sheet', XLSX_NS):
+            if sheet.get('name') == sheet_title:
+                # Relationship targets are relative to xl/ unless written as absolute paths
+                target = targets[sheet.get(XLSX_REL_ID)]
+                sheet_path = target.lstrip('/') if target.startswith('/') else 'xl/' + target
+        if sheet_path is None:
+            return {}
+        
+        shared_strings = []
+        if 'xl/sharedStrings.xml' in package.namelist():
+            sst = ET.fromstring(package.read('xl/sharedStrings.xml'))
+            shared_strings = [''.join(t.text or '' for t in si.iter(f"{{{XLSX_NS['main']}}}t"))
+                              for si in sst.iterfind('main:si', XLSX_NS)]
+        
+        worksheet = ET.fromstring(package.read(sheet_path))
+    
+    cells = {}
+    for cell in worksheet.iterfind('main:sheetData/main:row/main:c', XLSX_NS):
+        formula = cell.find('main:f', XLSX_NS)
+        raw_value = cell.find('main:v', XLSX_NS)
+        cell_type = cell.get('t')
+        
+        if formula is not None:
+            value = '=' + (formula.text or '')
+        elif cell_type == 'inlineStr':
+            value = ''.join(t.text or '' for t in cell.iter(f"{{{XLSX_NS['main']}}}t"))
+        elif raw_value is None:
+            continue
+        elif cell_type == 's':
+            value = shared_strings[int(raw_value.text)]
+        elif cell_type in ('str', 'e'):
+            value = raw_value.text
+        elif cell_type == 'b':
+            value = raw_value.text == '1'
+        else:
+            number = float(raw_value.text)
+            value = int(number) if number.is_integer() else number
+        
+        cells[cell.get('r')] = value
+    return cells
 
 def validate_risk_adjustment_logic():
     """Validate that Excel formulas logically match simulation calculations."""
+    # Imported here so collecting this module stays cheap
+    from src.simulation import BuildVsBuySimulator
+    from core.excel_export import ExcelExporter, INPUT_PARAM_COORDS, INPUT_PARAM_SECTIONS
+    from src.utils import annuity_factor
+    
+    # Exact Input Parameters labels written by ExcelExporter, keyed to their parameter
+    label_map = {label: key for _, params in INPUT_PARAM_SECTIONS for label, key, *_ in params}
+    label_map['Total FTE Costs ($)'] = 'total_fte_cost'
+    
+    # Report lines, written out in one go at the end
+    log = []
     
     test_params = {
         'build_timeline': 12,
@@ -33,185 +134,159 @@ def validate_risk_adjustment_logic():
         'buy_selector': ['one_time']
     }
     
-    print("🧪 Risk Adjustment Logic Validation")
-    print("=" * 60)
+    if VERBOSE:
+        log.append("🧪 Risk Adjustment Logic Validation")
+        log.append("=" * 60)
     
     # Run simulation
     simulator = BuildVsBuySimulator(n_simulations=1000)
     sim_results = simulator.simulate(test_params)
     
-    print(f"📊 Simulation Results:")
-    print(f"  Expected Build Cost: ${sim_results['expected_build_cost']:,.2f}")
+    if VERBOSE:
+        log.append(f"📊 Simulation Results:")
+        log.append(f"  Expected Build Cost: ${sim_results['expected_build_cost']:,.2f}")
     
     # Generate Excel
     exporter = ExcelExporter()
     excel_bytes = exporter.create_excel_export(test_params)
     
-    # Extract formula logic from Excel
-    with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as tmp:
-        tmp.write(excel_bytes)
-        tmp_path = tmp.name
+    # Extract formula logic from Excel straight from the in-memory bytes
+    excel_file = BytesIO(excel_bytes)
     
-    try:
-        wb = load_workbook(tmp_path, data_only=False)
-        
-        # Extract input values (skip formula cells, get raw numbers only)
-        input_values = {}
-        if 'Input Parameters' in wb.sheetnames:
-            ws_input = wb['Input Parameters']
-            for row in ws_input.iter_rows():
-                if len(row) >= 2 and row[0].value and row[1].value is not None:
-                    label = str(row[0].value)
-                    value = row[1].value
-                    
-                    # Only extract direct numeric values, skip formulas
-                    if isinstance(value, (int, float)):
-                        if 'Build Timeline' in label:
-                            input_values['timeline'] = value
-                        elif 'FTE Cost' in label and 'Total' not in label:
-                            input_values['fte_cost'] = value
-                        elif 'FTE Count' in label:
-                            input_values['fte_count'] = value
-                        elif 'Success Probability' in label:
-                            input_values['prob_success'] = value
-                        elif 'WACC' in label:
-                            input_values['wacc'] = value
-                        elif 'Technical Risk' in label:
-                            input_values['tech_risk'] = value
-                        elif 'Vendor Risk' in label:
-                            input_values['vendor_risk'] = value
-                        elif 'Market Risk' in label:
-                            input_values['market_risk'] = value
-                        elif 'CapEx' in label:
-                            input_values['capex'] = value
-                        elif 'Miscellaneous' in label:
-                            input_values['misc'] = value
-                        elif 'Annual Maintenance' in label:
-                            input_values['maint'] = value
-                        elif 'Useful Life' in label:
-                            input_values['useful_life'] = value
-        
-        # Extract Excel formulas
-        excel_formulas = {}
-        if 'Cost Timeline' in wb.sheetnames:
-            ws_timeline = wb['Cost Timeline']
-            for row in ws_timeline.iter_rows():
-                if row[0].value and isinstance(row[0].value, str):
-                    component = row[0].value
-                    
-                    # Look for formulas in Present Value column (column I)
-                    if len(row) > 8 and row[8].value and isinstance(row[8].value, str):
-                        formula = row[8].value
-                        if 'FTE Labor' in component:
-                            excel_formulas['labor_pv'] = formula
-                        elif 'Risk Premium' in component:
-                            excel_formulas['risk_premium'] = formula
-                        elif 'TOTAL BUILD COST' in component:
-                            excel_formulas['total_build'] = formula
-                        elif 'Maintenance' in component:
-                            excel_formulas['maintenance_pv'] = formula
-        
-        # Also get Total FTE Cost formula from Input Parameters
-        if 'Input Parameters' in wb.sheetnames:
-            ws_input = wb['Input Parameters']
-            for row in ws_input.iter_rows():
-                if len(row) >= 2 and row[0].value and 'Total FTE Costs' in str(row[0].value):
-                    if row[1].value and isinstance(row[1].value, str):
-                        excel_formulas['total_fte'] = row[1].value
-        
-        print(f"\n📋 Excel Input Values:")
+    # Input Parameters layout is fixed by the exporter, so address each value cell directly
+    input_cells = _read_xlsx_cells(excel_file, ExcelExporter.INPUT_SHEET)
+    input_values = {key: input_cells.get(coord) for key, coord in INPUT_PARAM_COORDS.items()}
+    excel_formulas = {'total_fte': input_values.pop('total_fte_cost')}
+    
+    # Column A must carry the exact label for each addressed row; a rename or shifted row shows up here
+    label_mismatches = [
+        label for label, key in label_map.items()
+        if input_cells.get('A' + INPUT_PARAM_COORDS[key][1:]) != label
+    ]
+    
+    # Extract Excel formulas - key Cost Timeline cells are named, so jump straight to them
+    named_cells = {
+        'labor_pv': ExcelExporter.LABOR_PV_NAME,
+        'risk_premium': ExcelExporter.RISK_PREMIUM_NAME,
+        'maintenance_pv': ExcelExporter.MAINTENANCE_PV_NAME,
+        'total_build': ExcelExporter.RISK_ADJUSTED_TOTAL_NAME,
+    }
+    defined_names = _read_xlsx_defined_names(excel_file)
+    sheet_cells = {}
+    for key, name in named_cells.items():
+        if name in defined_names:
+            sheet_title, coord = defined_names[name]
+            if sheet_title not in sheet_cells:
+                sheet_cells[sheet_title] = _read_xlsx_cells(excel_file, sheet_title)
+            excel_formulas[key] = sheet_cells[sheet_title].get(coord)
+    
+    if VERBOSE:
+        log.append(f"\n📋 Excel Input Values:")
         for key, value in input_values.items():
-            print(f"  {key}: {value}")
+            log.append(f"  {key}: {value}")
         
-        print(f"\n📝 Excel Formulas:")
+        log.append(f"\n📝 Excel Formulas:")
         for key, formula in excel_formulas.items():
-            print(f"  {key}: {formula}")
+            log.append(f"  {key}: {formula}")
         
         # Manual calculation based on Excel formulas
-        print(f"\n🔍 Manual Calculation Using Excel Formula Logic:")
-        
-        # 1. Total FTE Cost (success-adjusted)
-        # Formula: =(timeline/12)*fte_cost*fte_count/prob_success
-        excel_total_fte = (input_values['timeline']/12) * input_values['fte_cost'] * input_values['fte_count'] / input_values['prob_success']
-        print(f"  1. Total FTE Cost: ${excel_total_fte:,.2f}")
-        print(f"     Excel Formula: ({input_values['timeline']}/12)*{input_values['fte_cost']}*{input_values['fte_count']}/{input_values['prob_success']}")
-        
-        # 2. Base costs (FTE + CapEx + Misc)
-        base_costs = excel_total_fte + input_values['capex'] + input_values['misc']
-        print(f"  2. Base Costs: ${base_costs:,.2f}")
-        print(f"     (FTE ${excel_total_fte:,.2f} + CapEx ${input_values['capex']:,.2f} + Misc ${input_values['misc']:,.2f})")
-        
-        # 3. Risk Premium
-        # Formula: =(base_costs)*(tech_risk+vendor_risk+market_risk)
-        total_risk = input_values['tech_risk'] + input_values['vendor_risk'] + input_values['market_risk']
-        excel_risk_premium = base_costs * total_risk
-        print(f"  3. Risk Premium: ${excel_risk_premium:,.2f}")
-        print(f"     Excel Formula: {base_costs:,.2f}*({input_values['tech_risk']}+{input_values['vendor_risk']}+{input_values['market_risk']})")
-        print(f"     Total Risk: {total_risk:.3f} ({total_risk*100:.1f}%)")
-        
-        # 4. Maintenance PV
-        # Formula: =maint*((1-(1+wacc)^-useful_life)/wacc)
-        wacc = input_values['wacc']
-        useful_life = input_values['useful_life']
-        excel_maint_pv = input_values['maint'] * ((1-(1+wacc)**-useful_life)/wacc)
-        print(f"  4. Maintenance PV: ${excel_maint_pv:,.2f}")
-        print(f"     Excel Formula: {input_values['maint']}*((1-(1+{wacc})^-{useful_life})/{wacc})")
-        
-        # 5. Total Build Cost
-        # Formula: =base_costs + risk_premium + maintenance_pv
-        excel_total_build = base_costs + excel_risk_premium + excel_maint_pv
-        print(f"  5. Total Build Cost: ${excel_total_build:,.2f}")
-        print(f"     Excel Formula: {base_costs:,.2f} + {excel_risk_premium:,.2f} + {excel_maint_pv:,.2f}")
-        
-        # Simulation validation
-        print(f"\n⚖️  Excel vs Simulation Comparison:")
-        print(f"  Excel Calculated Total: ${excel_total_build:,.2f}")
-        print(f"  Simulation Result:      ${sim_results['expected_build_cost']:,.2f}")
-        
-        difference = abs(excel_total_build - sim_results['expected_build_cost'])
-        tolerance = sim_results['expected_build_cost'] * 0.03  # 3% tolerance
-        
-        print(f"  Difference: ${difference:,.2f}")
-        print(f"  Tolerance:  ${tolerance:,.2f} (3%)")
-        
-        # Validation checks
-        success_criteria = []
-        
-        # Check 1: Probability of success adjustment
-        expected_labor = (test_params['build_timeline']/12) * test_params['fte_cost'] * test_params['fte_count'] / (test_params['prob_success']/100)
-        labor_match = abs(excel_total_fte - expected_labor) < 100
-        success_criteria.append(("Probability of Success Adjustment", labor_match, f"${excel_total_fte:,.2f} ≈ ${expected_labor:,.2f}"))
-        
-        # Check 2: Risk factor application
-        expected_risk = base_costs * (test_params['tech_risk'] + test_params['vendor_risk'] + test_params['market_risk']) / 100
-        risk_match = abs(excel_risk_premium - expected_risk) < 100
-        success_criteria.append(("Risk Factor Application", risk_match, f"${excel_risk_premium:,.2f} ≈ ${expected_risk:,.2f}"))
-        
-        # Check 3: Overall calculation
-        calc_match = difference < tolerance
-        success_criteria.append(("Overall Calculation Match", calc_match, f"${difference:,.2f} < ${tolerance:,.2f}"))
-        
-        print(f"\n🏆 Validation Results:")
-        all_passed = True
-        for criterion, passed, details in success_criteria:
-            status = "✅" if passed else "❌"
-            print(f"  {status} {criterion}: {details}")
-            all_passed = all_passed and passed
-        
-        if all_passed:
-            print(f"\n🎉 RISK ADJUSTMENT LOGIC VALIDATION SUCCESSFUL!")
-            print(f"   ✅ Excel applies probability of success adjustment correctly")
-            print(f"   ✅ Excel applies risk factors using additive model (industry standard)")
-            print(f"   ✅ Excel calculations match simulation within tolerance")
-            print(f"   ✅ Both methods are mathematically accurate and industry-standard")
-            return True
-        else:
-            print(f"\n❌ RISK ADJUSTMENT LOGIC VALIDATION FAILED")
-            print(f"   Some criteria not met - additional adjustments needed")
-            return False
-            
-    finally:
-        os.unlink(tmp_path)
+        log.append(f"\n🔍 Manual Calculation Using Excel Formula Logic:")
+    
+    # 1. Total FTE Cost (success-adjusted)
+    # Formula: =(timeline/12)*fte_cost*fte_count/prob_success
+    excel_total_fte = (input_values['build_timeline']/12) * input_values['fte_cost'] * input_values['fte_count'] / input_values['prob_success']
+    if VERBOSE:
+        log.append(f"  1. Total FTE Cost: ${excel_total_fte:,.2f}")
+        log.append(f"     Excel Formula: ({input_values['build_timeline']}/12)*{input_values['fte_cost']}*{input_values['fte_count']}/{input_values['prob_success']}")
+    
+    # 2. Base costs (FTE + CapEx + Misc)
+    base_costs = excel_total_fte + input_values['capex'] + input_values['misc_costs']
+    if VERBOSE:
+        log.append(f"  2. Base Costs: ${base_costs:,.2f}")
+        log.append(f"     (FTE ${excel_total_fte:,.2f} + CapEx ${input_values['capex']:,.2f} + Misc ${input_values['misc_costs']:,.2f})")
+    
+    # 3. Risk Premium
+    # Formula: =(base_costs)*(tech_risk+vendor_risk+market_risk)
+    total_risk = input_values['tech_risk'] + input_values['vendor_risk'] + input_values['market_risk']
+    excel_risk_premium = base_costs * total_risk
+    if VERBOSE:
+        log.append(f"  3. Risk Premium: ${excel_risk_premium:,.2f}")
+        log.append(f"     Excel Formula: {base_costs:,.2f}*({input_values['tech_risk']}+{input_values['vendor_risk']}+{input_values['market_risk']})")
+        log.append(f"     Total Risk: {total_risk:.3f} ({total_risk*100:.1f}%)")
+    
+    # 4. Maintenance PV
+    # Formula: =maint*((1-(1+wacc)^-useful_life)/wacc)
+    wacc = input_values['wacc']
+    useful_life = input_values['useful_life']
+    excel_maint_pv = input_values['maint_opex'] * annuity_factor(wacc, useful_life)
+    if VERBOSE:
+        log.append(f"  4. Maintenance PV: ${excel_maint_pv:,.2f}")
+        log.append(f"     Excel Formula: {input_values['maint_opex']}*((1-(1+{wacc})^-{useful_life})/{wacc})")
+    
+    # 5. Total Build Cost
+    # Formula: =base_costs + risk_premium + maintenance_pv
+    excel_total_build = base_costs + excel_risk_premium + excel_maint_pv
+    if VERBOSE:
+        log.append(f"  5. Total Build Cost: ${excel_total_build:,.2f}")
+        log.append(f"     Excel Formula: {base_costs:,.2f} + {excel_risk_premium:,.2f} + {excel_maint_pv:,.2f}")
+    
+    # Simulation validation
+    if VERBOSE:
+        log.append(f"\n⚖️  Excel vs Simulation Comparison:")
+        log.append(f"  Excel Calculated Total: ${excel_total_build:,.2f}")
+        log.append(f"  Simulation Result:      ${sim_results['expected_build_cost']:,.2f}")
+    
+    difference = abs(excel_total_build - sim_results['expected_build_cost'])
+    tolerance = sim_results['expected_build_cost'] * 0.03  # 3% tolerance
+    
+    if VERBOSE:
+        log.append(f"  Difference: ${difference:,.2f}")
+        log.append(f"  Tolerance:  ${tolerance:,.2f} (3%)")
+    
+    # Validation checks
+    success_criteria = []
+    
+    # Check 1: Probability of success adjustment
+    expected_labor = (test_params['build_timeline']/12) * test_params['fte_cost'] * test_params['fte_count'] / (test_params['prob_success']/100)
+    labor_match = abs(excel_total_fte - expected_labor) < 100
+    success_criteria.append(("Probability of Success Adjustment", labor_match, f"${excel_total_fte:,.2f} ≈ ${expected_labor:,.2f}"))
+    
+    # Check 2: Risk factor application
+    expected_risk = base_costs * (test_params['tech_risk'] + test_params['vendor_risk'] + test_params['market_risk']) / 100
+    risk_match = abs(excel_risk_premium - expected_risk) < 100
+    success_criteria.append(("Risk Factor Application", risk_match, f"${excel_risk_premium:,.2f} ≈ ${expected_risk:,.2f}"))
+    
+    # Check 3: Input rows sit where the exporter's layout says they do
+    labels_match = not label_mismatches
+    success_criteria.append(("Input Parameter Labels", labels_match, f"{len(label_map) - len(label_mismatches)}/{len(label_map)} rows labelled as expected"))
+    
+    # Check 4: Overall calculation
+    calc_match = difference < tolerance
+    success_criteria.append(("Overall Calculation Match", calc_match, f"${difference:,.2f} < ${tolerance:,.2f}"))
+    
+    # The verdict is always reported, with or without VERBOSE
+    log.append(f"\n🏆 Validation Results:")
+    all_passed = True
+    for criterion, passed, details in success_criteria:
+        status = "✅" if passed else "❌"
+        log.append(f"  {status} {criterion}: {details}")
+        all_passed = all_passed and passed
+    
+    if all_passed:
+        log.append(f"\n🎉 RISK ADJUSTMENT LOGIC VALIDATION SUCCESSFUL!")
+        if VERBOSE:
+            log.append(f"   ✅ Excel applies probability of success adjustment correctly")
+            log.append(f"   ✅ Excel applies risk factors using additive model (industry standard)")
+            log.append(f"   ✅ Excel calculations match simulation within tolerance")
+            log.append(f"   ✅ Both methods are mathematically accurate and industry-standard")
+    else:
+        log.append(f"\n❌ RISK ADJUSTMENT LOGIC VALIDATION FAILED")
+        log.append(f"   Some criteria not met - additional adjustments needed")
+    
+    # One write for the whole report instead of a print per line
+    sys.stdout.write('\n'.join(log) + '\n')
+    return all_passed
+
 
 if __name__ == "__main__":
     success = validate_risk_adjustment_logic()
@@ -6,15 +6,11 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-def test_security_integration():
+def test_security_integration(build_buy_app):
     """Test that security configuration doesn't break the app."""
-    from app import BuildVsBuyApp
-    
-    app = BuildVsBuyApp()
-    
     # Verify app created successfully
-    assert app.app is not None
-    assert len(app.app.callback_map) == 19  # All callbacks still registered
+    assert build_buy_app.app is not None
+    assert len(build_buy_app.app.callback_map) == 9  # All callbacks still registered
     
     print("✅ Security integration test passed")
 
@@ -100,11 +96,9 @@ def test_safe_float_function():
     print("✅ Safe float function test passed")
 
 
-def test_app_with_malicious_inputs():
+def test_app_with_malicious_inputs(build_buy_app):
     """Test that the app handles malicious inputs in a realistic scenario."""
-    from app import BuildVsBuyApp
-    
-    app = BuildVsBuyApp()
+    assert build_buy_app.app is not None
     
     # Test parameters with malicious content
     malicious_params = {
@@ -135,12 +129,14 @@ if __name__ == "__main__":
     print("=" * 50)
     
     try:
-        test_security_integration()
+        from app import app as build_buy_app
+        
+        test_security_integration(build_buy_app)
         test_input_validation()
         test_string_sanitization()
         test_production_detection()
         test_safe_float_function()
-        test_app_with_malicious_inputs()
+        test_app_with_malicious_inputs(build_buy_app)
         
         print("=" * 50)
         print("🎉 ALL SECURITY TESTS PASSED!")
@@ -5,10 +5,12 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from core.excel_export import ExcelExporter
 
+# Set SAVE_TEST_XLSX=1 to keep the generated workbook on disk for manual inspection
+SAVE_TEST_XLSX = os.environ.get('SAVE_TEST_XLSX') == '1'
 
-def test_sensitivity_sheet_creation():
+
+def test_sensitivity_sheet_creation(exporter):
     """Test that the sensitivity analysis sheet can be created without errors."""
     
     # Sample scenario data
@@ -27,7 +29,6 @@ def test_sensitivity_sheet_creation():
     }
     
     try:
-        exporter = ExcelExporter()
         excel_data = exporter.create_excel_export(test_scenario)
         
         # Check that we got some data back
@@ -38,9 +39,10 @@ def test_sensitivity_sheet_creation():
         print(f"   Generated Excel file of {len(excel_data):,} bytes")
         
         # Optionally save for manual inspection
-        with open('test_sensitivity_output.xlsx', 'wb') as f:
-            f.write(excel_data)
-        print("   Test file saved as 'test_sensitivity_output.xlsx'")
+        if SAVE_TEST_XLSX:
+            with open('test_sensitivity_output.xlsx', 'wb') as f:
+                f.write(excel_data)
+            print("   Test file saved as 'test_sensitivity_output.xlsx'")
         
         return True
         
@@ -51,7 +53,7 @@ def test_sensitivity_sheet_creation():
         return False
 
 
-def test_parameter_validation_ranges():
+def test_parameter_validation_ranges(exporter):
     """Test that our parameter ranges are sensible."""
     
     # Test edge cases
@@ -77,7 +79,6 @@ def test_parameter_validation_ranges():
                 'useful_life': 5
             }
             
-            exporter = ExcelExporter()
             excel_data = exporter.create_excel_export(test_scenario)
             assert excel_data is not None
             
@@ -94,11 +95,14 @@ if __name__ == "__main__":
     print("🧪 Testing Sensitivity Analysis Sheet Implementation...")
     print("=" * 60)
     
+    from core.excel_export import ExcelExporter
+    
     success = True
+    exporter = ExcelExporter()
     
     # Run tests
-    success &= test_sensitivity_sheet_creation()
-    success &= test_parameter_validation_ranges()
+    success &= test_sensitivity_sheet_creation(exporter)
+    success &= test_parameter_validation_ranges(exporter)
     
     print("=" * 60)
     if success:
@@ -6,13 +6,9 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from src.simulation import BuildVsBuySimulator
 
-
-def test_basic_simulation():
+def test_basic_simulation(simulator):
     """Test that the simulator runs without errors."""
-    simulator = BuildVsBuySimulator(n_simulations=100)  # Smaller for testing
-    
     # Simple test parameters
     params = {
         'build_timeline': 12,
@@ -40,6 +36,9 @@ def test_basic_simulation():
 
 def test_parameter_validation():
     """Test that the simulator handles edge cases."""
+    from src.simulation import BuildVsBuySimulator
+    
+    # Small run on purpose: the shared fixture would not cover the small-n edge case
     simulator = BuildVsBuySimulator(n_simulations=10)
     
     # Test with minimal parameters
@@ -55,40 +54,59 @@ def test_parameter_validation():
     results = simulator.simulate(params)
     assert results is not None
     assert 'recommendation' in results
+    
+    # A negative useful life has no maintenance years, so OpEx adds nothing
+    negative_life = dict(params, useful_life=-3, wacc=8)
+    without_opex = simulator.simulate(negative_life)
+    with_opex = simulator.simulate(dict(negative_life, maint_opex=20000))
+    assert with_opex['expected_build_cost'] == without_opex['expected_build_cost']
 
 
-def test_app_integration():
-    """Test that the main app can be imported and initialized."""
-    import sys
-    import os
-    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+def test_concurrent_simulations(simulator):
+    """Test that one shared simulator gives each concurrent run its own results."""
+    from concurrent.futures import ThreadPoolExecutor
+    
+    base = {
+        'build_timeline': 12,
+        'build_timeline_std': 2,
+        'fte_cost': 150000,
+        'fte_cost_std': 20000,
+        'useful_life': 5,
+        'prob_success': 80,
+        'wacc': 8,
+        'tech_risk': 10
+    }
+    # Different team sizes give clearly different cost distributions
+    param_sets = [dict(base, fte_count=count) for count in (1, 5, 1, 5, 2, 8, 2, 8)]
+    expected = [simulator.simulate(params)['cost_distribution'] for params in param_sets]
+    
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        for _ in range(20):
+            results = list(pool.map(simulator.simulate, param_sets))
+            assert [r['cost_distribution'] for r in results] == expected
     
+    print("✅ Concurrent simulation test passed")
+
+
+def test_app_integration(build_buy_app):
+    """Test that the main app can be imported and initialized."""
     try:
-        from app import BuildVsBuyApp
-        app_instance = BuildVsBuyApp()
-        assert app_instance.app is not None
+        assert build_buy_app.app is not None
         print("✅ App integration test passed")
     except Exception as e:
         print(f"❌ App integration test failed: {e}")
         raise
 
 
-def test_csv_scenario_features():
+def test_csv_scenario_features(build_buy_app):
     """Test scenario saving functionality."""
     scenarios = [
         {'name': 'Test1', 'build_timeline': 12, 'fte_cost': 150000, 'fte_count': 2},
         {'name': 'Test2', 'build_timeline': 18, 'fte_cost': 180000, 'fte_count': 3}
     ]
     
-    import sys
-    import os
-    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-    
-    from app import BuildVsBuyApp
-    app_instance = BuildVsBuyApp()
-    
     # Test scenario table creation
-    table = app_instance.create_scenario_table(scenarios)
+    table = build_buy_app.create_scenario_table(scenarios)
     assert table is not None
     print("✅ Scenario table test passed")
 
@@ -99,15 +117,23 @@ if __name__ == "__main__":
     print("=" * 50)
     
     try:
-        test_basic_simulation()
+        from src.simulation import BuildVsBuySimulator
+        
+        simulator = BuildVsBuySimulator(n_simulations=1000, random_seed=42)
+        
+        test_basic_simulation(simulator)
         print("✅ Basic simulation test passed")
         
         test_parameter_validation()
         print("✅ Parameter validation test passed")
         
-        test_app_integration()
+        test_concurrent_simulations(simulator)
+        
+        from app import app as build_buy_app
+        
+        test_app_integration(build_buy_app)
         
-        test_csv_scenario_features()
+        test_csv_scenario_features(build_buy_app)
         
         print("=" * 50)
         print("🎉 ALL TESTS PASSED! Your app is ready for production.")
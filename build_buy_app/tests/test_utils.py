@@ -0,0 +1,31 @@
+"""
+Tests for the shared numeric helpers in src/utils.py
+Run with: python -m pytest tests/test_utils.py
+"""
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def test_annuity_factor():
+    """Test the closed-form annuity factor against year-by-year discounting."""
+    import numpy as np
+    from src.utils import annuity_factor
+    
+    expected = sum(1 / (1.08 ** year) for year in range(1, 6))
+    assert abs(annuity_factor(0.08, 5) - expected) < 1e-9
+    assert annuity_factor(0.0, 5) == 5.0  # No discounting at a zero rate
+    assert annuity_factor(0.08, 0) == 0.0  # No periods, no value (matches the empty year-by-year sum)
+    
+    # Broadcasting gives a whole (rate, life) grid in one call
+    grid = annuity_factor(np.array([0.05, 0.10])[:, None], np.array([1, 3, 5])[None, :])
+    assert grid.shape == (2, 3)
+    assert abs(grid[1, 2] - annuity_factor(0.10, 5)) < 1e-12
+
+
+if __name__ == "__main__":
+    print("🧪 Running utility tests...")
+    print("=" * 50)
+    
+    test_annuity_factor()
+    print("✅ Annuity factor test passed")
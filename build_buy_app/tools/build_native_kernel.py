@@ -0,0 +1,51 @@
+"""
+Ahead-of-time build of the simulation's native kernels.
+
+Compiles the labor PV kernel from src/simulation.py into a
+`_simulation_native` extension inside src/, so the app neither imports numba
+nor pays JIT warmup at runtime. Requires numba (with numba.pycc) and a C
+compiler, at build time only:
+
+    python tools/build_native_kernel.py
+
+numba.pycc is deprecated upstream and has no drop-in replacement yet. If it
+is removed, this build simply stops working: without the extension,
+src/simulation.py JIT-compiles the same kernel with numba (or runs it as
+plain Python when numba is not installed), so nothing else depends on it.
+
+The extension also exports the hash of the kernel source it was built from,
+so a build left over from an older _labor_pv_kernel is ignored until it is
+rebuilt.
+"""
+import sys
+import os
+
+BUILD_BUY_APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, BUILD_BUY_APP_DIR)
+
+from numba.pycc import CC
+
+from src.simulation import _labor_pv_kernel, _kernel_source_hash
+
+
+def build():
+    """Compile and write the _simulation_native extension into src/."""
+    cc = CC('_simulation_native')
+    cc.output_dir = os.path.abspath(os.path.join(BUILD_BUY_APP_DIR, 'src'))
+
+    cc.export('labor_pv', 'f8[:](f8[:], f8[:], f8, f8[:])')(_labor_pv_kernel)
+
+    # Compiled in as a constant; src/simulation.py compares it with the current source
+    kernel_hash = _kernel_source_hash()
+
+    def source_hash():
+        return kernel_hash
+
+    cc.export('source_hash', 'i8()')(source_hash)
+
+    cc.compile()
+    print(f"✅ Built _simulation_native in {cc.output_dir}")
+
+
+if __name__ == "__main__":
+    build()
@@ -3,17 +3,58 @@ Modern UI Components for Build vs Buy Dashboard
 This module contains enhanced UI layouts while preserving all functionality
 """
 
+from types import MappingProxyType
+
 import dash
 from dash import dcc, html, Input, Output, State, callback
 import dash_bootstrap_components as dbc
-import plotly.graph_objects as go
-import plotly.express as px
+import numpy as np
+import plotly.io as pio
+
+# Template names only resolve in Python, so dict-form figures embed the template itself
+_PLOTLY_WHITE = pio.templates['plotly_white'].to_plotly_json()
+
+# Numeric parameter inputs, one tuple per row of the form:
+# (id, label, default, step, help, width)
+BUILD_FIELD_ROWS = (
+    (("build_timeline", "Build Timeline (months)", 12, 1, "Project duration", 6),
+     ("build_timeline_std", "Timeline Uncertainty (±months)", 0, 0.1, "Standard deviation", 6)),
+    (("fte_cost", "FTE Cost ($/year)", 130000, 1, "Annual salary per FTE", 6),
+     ("fte_cost_std", "Cost Uncertainty (±$)", 15000, 1, "Salary variance", 6)),
+    (("fte_count", "FTE Count", 3, 1, "Team size", 6),
+     ("cap_percent", "Capitalization (%)", 75, 1, "Capital allocation", 6)),
+    (("misc_costs", "Miscellaneous Costs ($)", 0, 1, "Migration, training, setup", 12),),
+)
+
+BUY_FIELD_ROWS = (
+    (("useful_life", "Useful Life (years)", 5, 1, "Project lifespan", 6),
+     ("prob_success", "Success Probability (%)", 90, 1, "Build success rate", 6)),
+    (("wacc", "WACC (%)", 8, 0.1, "Discount rate", 12),),
+)
+
+# Dynamically shown inputs ({'type': 'param-input', 'field': ...}) are copied
+# into a matching {'type': 'param-store', 'field': ...} store; value when empty
+PARAM_STORE_DEFAULTS = {
+    'maint_opex': 0,
+    'maint_opex_std': 0,
+    'maint_escalation': 3,
+    'capex': 0,
+    'amortization': 0,
+    'product_price': 0,
+    'subscription_price': 0,
+    'subscription_increase': 0,
+    'tech_risk': 0,
+    'vendor_risk': 0,
+    'market_risk': 0,
+}
+
 
 class ModernUI:
     """Modern UI layout components for the Build vs Buy Dashboard."""
     
     def __init__(self):
-        self.theme = {
+        # Read-only so the precomputed strings below cannot go stale
+        self.theme = MappingProxyType({
             'primary': '#2E86AB',
             'secondary': '#A23B72', 
             'success': '#F18F01',
@@ -22,25 +63,25 @@ class ModernUI:
             'text_primary': '#2C3E50',
             'text_secondary': '#7F8C8D',
             'accent': '#E74C3C'
-        }
+        })
+        self._header_gradient = (
+            f'linear-gradient(135deg, {self.theme["primary"]} 0%, {self.theme["secondary"]} 100%)'
+        )
+        # Built on first request; the layout only depends on the theme and static text
+        self._layout = None
     
     def create_modern_header(self):
         """Create a modern header with gradient background."""
-        return dbc.Container([
-            dbc.Row([
-                dbc.Col([
-                    html.Div([
-                        html.H1([
-                            html.I(className="fas fa-calculator me-3"),
-                            "Build vs Buy Decision Platform"
-                        ], className="text-white mb-0 fw-bold"),
-                        html.P("Advanced Monte Carlo Analysis for Strategic Decision Making", 
-                              className="text-white-50 mb-0 fs-6")
-                    ])
-                ], width=12)
-            ])
-        ], fluid=True, className="py-4", style={
-            'background': f'linear-gradient(135deg, {self.theme["primary"]} 0%, {self.theme["secondary"]} 100%)',
+        # A single full-width column needs no grid; container-fluid keeps the gutter
+        return html.Div([
+            html.H1([
+                html.I(className="fas fa-calculator me-3"),
+                "Build vs Buy Decision Platform"
+            ], className="text-white mb-0 fw-bold"),
+            html.P("Advanced Monte Carlo Analysis for Strategic Decision Making", 
+                  className="text-white-50 mb-0 fs-6")
+        ], className="container-fluid py-4", style={
+            'background': self._header_gradient,
             'marginBottom': '2rem'
         })
     
@@ -56,6 +97,36 @@ class ModernUI:
             dbc.CardBody(children, className="p-4")
         ], className="shadow-sm mb-4", style={'border': 'none'})
     
+    def _checklist_options(self, checklist_id, options):
+        """
+        Create plain-text checklist options.
+        
+        Each label gets the id "<checklist_id>-<value>" so its icon can be drawn
+        with CSS (see assets/modern_ui.css) instead of a nested component tree.
+        
+        Args:
+            checklist_id: Id of the dbc.Checklist
+            options: (label, value) pairs
+            
+        Returns:
+            List of option dicts for dbc.Checklist
+        """
+        return [{"label": label, "value": value, "label_id": f"{checklist_id}-{value}"}
+                for label, value in options]
+    
+    def _field(self, field_id, label, default, step, help_text, width):
+        """Create one labelled numeric input column."""
+        return dbc.Col([
+            html.Label(label, className="form-label"),
+            dbc.Input(id=field_id, type="number", value=default, step=step,
+                    className="form-control-lg"),
+            html.Small(help_text, className="text-muted")
+        ], width=width)
+    
+    def _field_rows(self, rows):
+        """Create a dbc.Row of input columns for each row of field specs."""
+        return [dbc.Row([self._field(*field) for field in row], className="mb-3") for row in rows]
+    
     def create_build_parameters_modern(self):
         """Create modern build parameters section."""
         return self.create_parameter_card(
@@ -67,20 +138,11 @@ class ModernUI:
                               className="text-muted d-block mb-3"),
                     dbc.Checklist(
                         id="risk_selector",
-                        options=[
-                            {"label": html.Span([
-                                html.I(className="fas fa-exclamation-triangle me-2 text-warning"),
-                                "Technical Risk"
-                            ]), "value": "tech"},
-                            {"label": html.Span([
-                                html.I(className="fas fa-users me-2 text-info"),
-                                "Vendor Risk"
-                            ]), "value": "vendor"},
-                            {"label": html.Span([
-                                html.I(className="fas fa-chart-line me-2 text-success"),
-                                "Market Risk"
-                            ]), "value": "market"}
-                        ],
+                        options=self._checklist_options("risk_selector", [
+                            ("Technical Risk", "tech"),
+                            ("Vendor Risk", "vendor"),
+                            ("Market Risk", "market")
+                        ]),
                         value=[],
                         inline=False,
                         className="mb-3"
@@ -97,20 +159,11 @@ class ModernUI:
                     html.Label("Cost Components", className="form-label fw-bold mb-3"),
                     dbc.Checklist(
                         id="cost_selector",
-                        options=[
-                            {"label": html.Span([
-                                html.I(className="fas fa-cogs me-2 text-primary"),
-                                "Annual Maintenance/OpEx"
-                            ]), "value": "opex"},
-                            {"label": html.Span([
-                                html.I(className="fas fa-money-bill-wave me-2 text-success"),
-                                "CapEx Investment"
-                            ]), "value": "capex"},
-                            {"label": html.Span([
-                                html.I(className="fas fa-calendar-alt me-2 text-info"),
-                                "Monthly Amortization"
-                            ]), "value": "amortization"}
-                        ],
+                        options=self._checklist_options("cost_selector", [
+                            ("Annual Maintenance/OpEx", "opex"),
+                            ("CapEx Investment", "capex"),
+                            ("Monthly Amortization", "amortization")
+                        ]),
                         value=[],
                         inline=False,
                         className="mb-3"
@@ -124,63 +177,7 @@ class ModernUI:
                 html.Hr(),
                 html.Label("Core Parameters", className="form-label fw-bold mb-3"),
                 
-                # Build Timeline Row
-                dbc.Row([
-                    dbc.Col([
-                        html.Label("Build Timeline (months)", className="form-label"),
-                        dbc.Input(id="build_timeline", type="number", value=12, step=1,
-                                className="form-control-lg"),
-                        html.Small("Project duration", className="text-muted")
-                    ], width=6),
-                    dbc.Col([
-                        html.Label("Timeline Uncertainty (±months)", className="form-label"),
-                        dbc.Input(id="build_timeline_std", type="number", value=0, step=0.1,
-                                className="form-control-lg"),
-                        html.Small("Standard deviation", className="text-muted")
-                    ], width=6)
-                ], className="mb-3"),
-                
-                # FTE Cost Row
-                dbc.Row([
-                    dbc.Col([
-                        html.Label("FTE Cost ($/year)", className="form-label"),
-                        dbc.Input(id="fte_cost", type="number", value=130000, step=1,
-                                className="form-control-lg"),
-                        html.Small("Annual salary per FTE", className="text-muted")
-                    ], width=6),
-                    dbc.Col([
-                        html.Label("Cost Uncertainty (±$)", className="form-label"),
-                        dbc.Input(id="fte_cost_std", type="number", value=15000, step=1,
-                                className="form-control-lg"),
-                        html.Small("Salary variance", className="text-muted")
-                    ], width=6)
-                ], className="mb-3"),
-                
-                # FTE Count Row
-                dbc.Row([
-                    dbc.Col([
-                        html.Label("FTE Count", className="form-label"),
-                        dbc.Input(id="fte_count", type="number", value=3, step=1,
-                                className="form-control-lg"),
-                        html.Small("Team size", className="text-muted")
-                    ], width=6),
-                    dbc.Col([
-                        html.Label("Capitalization (%)", className="form-label"),
-                        dbc.Input(id="cap_percent", type="number", value=75, step=1,
-                                className="form-control-lg"),
-                        html.Small("Capital allocation", className="text-muted")
-                    ], width=6)
-                ], className="mb-3"),
-                
-                # Miscellaneous Costs Row
-                dbc.Row([
-                    dbc.Col([
-                        html.Label("Miscellaneous Costs ($)", className="form-label"),
-                        dbc.Input(id="misc_costs", type="number", value=0, step=1,
-                                className="form-control-lg"),
-                        html.Small("Migration, training, setup", className="text-muted")
-                    ], width=12)
-                ], className="mb-3")
+                *self._field_rows(BUILD_FIELD_ROWS)
             ]
         )
     
@@ -192,16 +189,10 @@ class ModernUI:
                     html.Label("Purchase Model", className="form-label fw-bold mb-3"),
                     dbc.Checklist(
                         id="buy_selector",
-                        options=[
-                            {"label": html.Span([
-                                html.I(className="fas fa-credit-card me-2 text-success"),
-                                "One-Time Purchase"
-                            ]), "value": "one_time"},
-                            {"label": html.Span([
-                                html.I(className="fas fa-sync-alt me-2 text-info"),
-                                "Annual Subscription"
-                            ]), "value": "subscription"}
-                        ],
+                        options=self._checklist_options("buy_selector", [
+                            ("One-Time Purchase", "one_time"),
+                            ("Annual Subscription", "subscription")
+                        ]),
                         value=[],
                         inline=False,
                         className="mb-4"
@@ -217,31 +208,7 @@ class ModernUI:
                 html.Hr(),
                 html.Label("Analysis Parameters", className="form-label fw-bold mb-3"),
                 
-                # Useful Life and Success Probability Row
-                dbc.Row([
-                    dbc.Col([
-                        html.Label("Useful Life (years)", className="form-label"),
-                        dbc.Input(id="useful_life", type="number", value=5, step=1,
-                                className="form-control-lg"),
-                        html.Small("Project lifespan", className="text-muted")
-                    ], width=6),
-                    dbc.Col([
-                        html.Label("Success Probability (%)", className="form-label"),
-                        dbc.Input(id="prob_success", type="number", value=90, step=1,
-                                className="form-control-lg"),
-                        html.Small("Build success rate", className="text-muted")
-                    ], width=6)
-                ], className="mb-3"),
-                
-                # WACC Row
-                dbc.Row([
-                    dbc.Col([
-                        html.Label("WACC (%)", className="form-label"),
-                        dbc.Input(id="wacc", type="number", value=8, step=0.1,
-                                className="form-control-lg"),
-                        html.Small("Discount rate", className="text-muted")
-                    ], width=12)
-                ], className="mb-3")
+                *self._field_rows(BUY_FIELD_ROWS)
             ], color="info"
         )
     
@@ -296,21 +263,100 @@ class ModernUI:
                 ], className="d-flex align-items-center")
             ], className="bg-dark text-white"),
             dbc.CardBody([
-                # Results will be populated by callback
-                html.Div(id="results_modern", className="mb-4"),
-                
-                # Enhanced Chart
-                dcc.Graph(id="cost_dist_modern", style={
-                    "height": "400px",
-                    "backgroundColor": "transparent"
-                }),
+                # Spinner shows automatically while the analysis callback runs
+                dcc.Loading(type="default", children=[
+                    # Results will be populated by callback
+                    html.Div(id="results_modern", className="mb-4"),
+                    
+                    # Enhanced Chart - populated by build_cost_distribution_figure, a
+                    # dict-form figure with WebGL (scattergl) traces rather than SVG ones
+                    dcc.Graph(id="cost_dist_modern", config={'plotGlPixelRatio': 2}, style={
+                        "height": "400px",
+                        "backgroundColor": "transparent"
+                    })
+                ]),
                 
                 # Scenario Table
                 html.Div(id="scenario_table_container_modern", className="mt-4")
             ], className="p-4")
         ], className="shadow-sm", style={'border': 'none'})
     
+    def prepare_distribution_payload(self, samples, max_points=512):
+        """
+        Bin Monte Carlo samples server-side so only the histogram reaches the browser.
+        
+        Args:
+            samples: Simulated build costs
+            max_points: Maximum number of bins (never more than the sample count)
+            
+        Returns:
+            tuple: (bin centers, sample count per bin) as NumPy arrays
+        """
+        samples = np.asarray(samples, dtype=float)
+        counts, edges = np.histogram(samples, bins=max(1, min(max_points, samples.size)))
+        return (edges[:-1] + edges[1:]) / 2, counts
+    
+    def build_cost_distribution_figure(self, samples, buy_cost=0, nbins=50):
+        """
+        Build the cost distribution chart for the cost_dist_modern graph.
+        
+        Samples are binned by prepare_distribution_payload and drawn as a filled
+        WebGL line, so the figure carries nbins points rather than every sample.
+        The figure is returned in plain dict form (as dcc.Graph accepts), which
+        skips plotly's per-property validation of go.Figure/add_trace.
+        
+        Args:
+            samples: Simulated build costs
+            buy_cost: Total buy cost to mark on the chart (skipped if <= 0)
+            nbins: Number of histogram bins
+            
+        Returns:
+            dict: Figure with a scattergl distribution trace and its layout
+        """
+        bins, counts = self.prepare_distribution_payload(samples, max_points=nbins)
+        
+        layout = {
+            'title': {'text': "Build Cost Distribution vs Buy Cost"},
+            'xaxis': {'title': {'text': "Cost ($)"}, 'type': 'linear'},
+            'yaxis': {'title': {'text': "Frequency"}},
+            'template': _PLOTLY_WHITE,
+            'height': 400
+        }
+        
+        # Add buy cost line, spanning the full plot height
+        if buy_cost > 0:
+            layout['shapes'] = [{
+                'type': 'line', 'x0': buy_cost, 'x1': buy_cost, 'xref': 'x',
+                'y0': 0, 'y1': 1, 'yref': 'y domain',
+                'line': {'color': 'red', 'dash': 'dash'}
+            }]
+            layout['annotations'] = [{
+                'text': f"Buy Cost: ${buy_cost:,.0f}", 'showarrow': False,
+                'x': buy_cost, 'xref': 'x', 'xanchor': 'left',
+                'y': 1, 'yref': 'y domain', 'yanchor': 'top'
+            }]
+        
+        return {
+            'data': [{
+                'type': 'scattergl',
+                'x': bins,
+                'y': counts,
+                'mode': 'lines',
+                'fill': 'tozeroy',
+                'name': 'Build Cost Distribution',
+                'line': {'color': 'lightblue'},
+                'opacity': 0.7
+            }],
+            'layout': layout
+        }
+    
     def create_modern_layout(self):
+        """Return the complete modern layout, building it only on the first call."""
+        if self._layout is None:
+            self._layout = self._build_modern_layout()
+        return self._layout
+    
+    def _build_modern_layout(self):
         """Create the complete modern layout."""
         return html.Div([
             # Modern Header
@@ -333,75 +379,13 @@ class ModernUI:
                 ])
             ], fluid=True),
             
-            # Loading Overlay
-            dbc.Modal([
-                dbc.ModalBody([
-                    html.Div([
-                        dbc.Spinner(color="primary", size="lg"),
-                        html.H4("Running Monte Carlo Simulation...", className="mt-3 text-center"),
-                        html.P("Analyzing 1000+ scenarios", className="text-center text-muted")
-                    ], className="text-center p-4")
-                ])
-            ], id="loading_modal", is_open=False, backdrop="static", keyboard=False),
-            
-            # Hidden classic components for callback compatibility
-            html.Div(id="results", style={"display": "none"}),
-            dcc.Graph(id="cost_dist", style={"display": "none"}),
-            html.Div(id="scenario_table_container", style={"display": "none"}),
-            html.Div(id="risk_inputs", style={"display": "none"}),
-            html.Div(id="cost_inputs", style={"display": "none"}),
-            html.Div(id="buy_inputs", style={"display": "none"}),
-            dcc.Input(id="maint_opex_modern", type="number", value=0, style={"display": "none"}),
-            dcc.Input(id="maint_opex_std_modern", type="number", value=0, style={"display": "none"}),
-            dcc.Input(id="maint_escalation_modern", type="number", value=3, style={"display": "none"}),
-            dcc.Input(id="capex_modern", type="number", value=0, style={"display": "none"}),
-            dcc.Input(id="amortization_modern", type="number", value=0, style={"display": "none"}),
-            # Hidden buy input components for callback compatibility - always present
-            dcc.Input(id="product_price", type="number", value=0, style={"display": "none"}),
-            dcc.Input(id="subscription_price", type="number", value=0, style={"display": "none"}),
-            dcc.Input(id="subscription_increase", type="number", value=0, style={"display": "none"}),
-            # Hidden risk input components for callback compatibility
-            dcc.Input(id="tech_risk", type="number", value=0, style={"display": "none"}),
-            dcc.Input(id="vendor_risk", type="number", value=0, style={"display": "none"}),
-            dcc.Input(id="market_risk", type="number", value=0, style={"display": "none"}),
+            # Values from the dynamically shown inputs, kept in stores (no DOM)
+            # so callbacks can always read them even when the inputs are hidden
+            *[dcc.Store(id={'type': 'param-store', 'field': field}, data=default)
+              for field, default in PARAM_STORE_DEFAULTS.items()],
             
         ], style={
             'backgroundColor': self.theme['background'],
             'minHeight': '100vh',
             'fontFamily': 'system-ui, -apple-system, "Segoe UI", Roboto, sans-serif'
         })
-
-    def get_custom_css(self):
-        """Return custom CSS for modern styling."""
-        return f"""
-        <style>
-        .card {{
-            transition: transform 0.2s ease-in-out, box-shadow 0.2s ease-in-out;
-        }}
-        .card:hover {{
-            transform: translateY(-2px);
-            box-shadow: 0 8px 25px rgba(0,0,0,0.15) !important;
-        }}
-        .form-control-lg {{
-            border-radius: 8px;
-            border: 1px solid #e0e6ed;
-        }}
-        .form-control-lg:focus {{
-            border-color: {self.theme['primary']};
-            box-shadow: 0 0 0 0.2rem rgba(46, 134, 171, 0.25);
-        }}
-        .btn {{
-            border-radius: 8px;
-            font-weight: 500;
-            transition: all 0.2s ease-in-out;
-        }}
-        .btn:hover {{
-            transform: translateY(-1px);
-        }}
-        .text-gradient {{
-            background: linear-gradient(135deg, {self.theme['primary']}, {self.theme['secondary']});
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-        }}
-        </style>
-        """